@@ -2,19 +2,30 @@
 
 from solver import Solver
 
-def rate(grid):
+def rate(grid, known_level=None, solver=None):
     """Rate puzzle difficulty by trying solver at each level.
     
     Args:
         grid: the puzzle to rate
+        known_level: optional level the puzzle is already known to be
+            solvable at (e.g. the generator's target difficulty). Levels
+            above it are not tried, since they cannot change the result.
+        solver: optional Solver to reuse instead of creating a new one
     Returns:
         int: difficulty level (1-4)
     """
-    solver = Solver()
+    if solver is None:
+        solver = Solver()
+    top_level = 4 if known_level is None else known_level
     
-    for level in [1, 2, 3, 4]:
-        result = solver.solve(grid.clone(), max_difficulty=level)
+    # One scratch copy for every level: only the values need resetting
+    work = grid.clone()
+    values = grid.get_values()
+    
+    for level in range(1, top_level):
+        work.set_values(values)
+        result = solver.solve_in_place(work, max_difficulty=level)
         if result.solved:
             return level
     
-    return 4  # Expert if not solvable with our techniques
\ No newline at end of file
+    return top_level  # known level, or Expert if not solvable with our techniques
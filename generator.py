@@ -1,14 +1,57 @@
+import concurrent.futures
 import random
+from functools import lru_cache
+from itertools import permutations
 from typing import List
 from models import Grid, Cell, Group
 from group_generator import GroupGenerator
 from solver import Solver
 from difficulty import rate
 
+MAX_PERMUTED_VALUES = 6   # 6! = 720 orders per mask; beyond that, shuffle
+MAX_REMOVAL_BATCH = 8     # most clues _remove_clues drops before one check
+MAX_ATTEMPTS = 25         # independent tries per Generator.generate call
+
+
+def _mask_bits(mask):
+    """Return the single-bit masks set in mask, lowest first (0b101 -> [1, 4])."""
+    bits = []
+    while mask:
+        low = mask & -mask
+        bits.append(low)
+        mask ^= low
+    return bits
+
+
+@lru_cache(maxsize=None)
+def _value_orders(mask):
+    """Return every ordering of the value bits set in mask.
+
+    Lets the fill pick a random try order with one random.choice()
+    instead of building and shuffling a list at every search node.
+    Only used for masks with at most MAX_PERMUTED_VALUES bits.
+    """
+    return tuple(permutations(_mask_bits(mask)))
+
+
 class FillTimeout(Exception):
     """Raised when fill_grid takes too long or hits too many failures."""
     pass
 
+def _run_attempt(settings, attempt, attempt_seed):
+    """Run one Generator attempt in a worker process.
+
+    Module-level so ProcessPoolExecutor can pickle it; builds a fresh
+    Generator from the parent's settings.
+    """
+    min_group_size, max_group_size, verbose, rows, cols, difficulty, removal_percentage = settings
+    gen = Generator()
+    gen.group_generator.min_size = min_group_size
+    gen.group_generator.max_size = max_group_size
+    gen.verbose = verbose
+    return gen._attempt(attempt, rows, cols, difficulty, removal_percentage, attempt_seed)
+
+
 class Generator:
     """Full puzzle generator: groups -> fill -> remove clues -> rate.
     
@@ -17,10 +60,15 @@ class Generator:
     """
 
     def __init__(self):
-        """Create a Generator with a default GroupGenerator."""
+        """Create a Generator with a default GroupGenerator and Solver.
+
+        The solver is shared by clue removal and rating across all
+        attempts instead of being recreated for each.
+        """
         self.group_generator = GroupGenerator()
+        self.solver = Solver()
 
-    def generate(self, rows, cols, difficulty=2, removal_percentage=1.0, max_group_size=5, min_group_size=2, seed=None, verbose=False):
+    def generate(self, rows, cols, difficulty=2, removal_percentage=1.0, max_group_size=5, min_group_size=2, seed=None, verbose=False, workers=1):
         """Generate a complete Suguru puzzle.
 
         Full pipeline (for now just steps 1-2, more added in steps 6-7):
@@ -29,6 +77,11 @@ class Generator:
             3. (Later) Remove clues while maintaining unique solvability
             4. (Later) Rate and adjust difficulty
 
+        Up to MAX_ATTEMPTS independent attempts are made, each with its
+        own seed drawn up front. With workers > 1 they run in a process
+        pool; attempts are still checked in order, so a given seed gives
+        the same puzzle whatever the worker count.
+
         Args:
             rows: number of rows
             cols: number of columns
@@ -36,6 +89,8 @@ class Generator:
             max_group_size: largest allowed group size
             min_group_size: smallest allowed group size
             seed: random seed for reproducibility (None = random)
+            workers: number of processes to spread attempts over
+                (1 = run them in this process)
         Returns:
             Grid with all cells filled (a complete valid solution),
             or None if generation failed after retries
@@ -48,64 +103,95 @@ class Generator:
         self.group_generator.max_size = max_group_size
         self.verbose = verbose
         
-        MAX_ATTEMPTS = 25
+        attempt_seeds = [random.randrange(2**32) for _ in range(MAX_ATTEMPTS)]
+
+        if workers <= 1:
+            for attempt, attempt_seed in enumerate(attempt_seeds):
+                grid = self._attempt(attempt, rows, cols, difficulty, removal_percentage, attempt_seed)
+                if grid is not None:
+                    return grid
+            return None
+
+        settings = (min_group_size, max_group_size, verbose,
+                    rows, cols, difficulty, removal_percentage)
+        executor = concurrent.futures.ProcessPoolExecutor(workers)
+        try:
+            futures = [executor.submit(_run_attempt, settings, attempt, attempt_seed)
+                       for attempt, attempt_seed in enumerate(attempt_seeds)]
+            for future in futures:
+                grid = future.result()
+                if grid is not None:
+                    return grid
+        finally:
+            # drop queued attempts and don't wait on running ones once we have a puzzle
+            executor.shutdown(wait=False, cancel_futures=True)
         
-        for attempt in range(MAX_ATTEMPTS):
-            if verbose:
-                print(f"\n=== Attempt {attempt + 1}/{MAX_ATTEMPTS} ===")
+        return None
+
+    def _attempt(self, attempt, rows, cols, difficulty, removal_percentage, attempt_seed):
+        """Run one full generation attempt from its own seed.
+
+        Returns:
+            the puzzle Grid, or None if this attempt failed at any step
+        """
+        random.seed(attempt_seed)
+        verbose = self.verbose
+
+        if verbose:
+            print(f"\n=== Attempt {attempt + 1}/{MAX_ATTEMPTS} ===")
+    
+        # Step 1: Generate group layout
+        if verbose:
+            print("Step 1: Generating groups...")
+        layout = self.group_generator.generate(rows, cols, )
         
-            # Step 1: Generate group layout
-            if verbose:
-                print("Step 1: Generating groups...")
-            layout = self.group_generator.generate(rows, cols, )
-            
-            if layout is None:
-                if verbose:
-                    print("  Failed: group layout generation")
-                continue
-            if verbose:
-                print("  Success: groups generated")
-            
-            # Step 2: Build and fill grid
-            if verbose:
-                print("Step 2: Building grid...")
-            grid = Grid(rows, cols)
-            grid.build_cells(layout)
+        if layout is None:
             if verbose:
-                print("  Grid built")
+                print("  Failed: group layout generation")
+            return None
+        if verbose:
+            print("  Success: groups generated")
+        
+        # Step 2: Build and fill grid
+        if verbose:
+            print("Step 2: Building grid...")
+        grid = Grid(rows, cols)
+        grid.build_cells(layout)
+        if verbose:
+            print("  Grid built")
 
+        if verbose:
+            print("Step 3: Filling grid with backtracking...")
+        if not self._fill_grid(grid):
             if verbose:
-                print("Step 3: Filling grid with backtracking...")
-            if not self._fill_grid(grid):
-                if verbose:
-                    print("  Failed: couldn't fill grid (unsolvable layout)")
-                continue
-            if verbose:
-                print("  Success: grid filled")
-            
-            # Step 4: Remove clues
+                print("  Failed: couldn't fill grid (unsolvable layout)")
+            return None
+        if verbose:
+            print("  Success: grid filled")
+        
+        # Step 4: Remove clues
+        if verbose:
+            print("Step 4: Removing clues...")
+        solution = grid.clone()
+        grid.solution = solution  # never mutated, so one copy serves both
+        self._remove_clues(grid, solution, difficulty, removal_percentage)
+        
+        # Step 5: Difficulty Rating
+        if verbose:
+            print("Step 5: Difficulty Rating...")
+
+        # _remove_clues only keeps removals the solver handles at
+        # `difficulty`, so higher levels never need to be tried
+        actual_difficulty = rate(grid, known_level=difficulty, solver=self.solver)
+        self.solver.reset()
+        if  actual_difficulty == difficulty:
             if verbose:
-                print("Step 4: Removing clues...")
-            solution = grid.clone()
-            grid.solution = grid.clone()
-            self._remove_clues(grid, solution, difficulty, removal_percentage)
-            
-            # Step 5: Difficulty Rating
+                print(f"  Generated difficulty {actual_difficulty} puzzle")
+            return grid
+        else:
             if verbose:
-                print("Step 5: Difficulty Rating...")
-
-            actual_difficulty = rate(grid)
-            if  actual_difficulty == difficulty:
-                if verbose:
-                    print(f"  Generated difficulty {actual_difficulty} puzzle")
-                return grid
-            else:
-                if verbose:
-                    print(f"  ✗ Mismatch, retrying...")
-                continue  # Try again
-            
-        
-        return None
+                print(f"  ✗ Mismatch, retrying...")
+            return None  # Try again
 
     def _fill_grid(self, grid):
         """Fill every cell with a valid value using backtracking.
@@ -114,6 +200,9 @@ class Generator:
         the empty cell with fewest possible values to try next.
         Values are tried in random order for puzzle variety.
 
+        The search runs on flat per-cell lists (see _flatten_grid)
+        instead of Cell objects; values are written back on success.
+
         Args:
             grid: Grid with groups assigned but cells empty
         Returns:
@@ -124,79 +213,150 @@ class Generator:
         self.fill_start_time = time.time()
         self.early_failures = 0  # count how many times we hit dead ends early
         
+        bits, full_masks, blockers = self._flatten_grid(grid)
+
         try: 
-            result = self._fill_grid_recursive(grid, depth=0)
+            result = self._fill_flat(bits, full_masks, blockers)
             elapsed = time.time() - self.fill_start_time
             # print(f"    Backtracking: {elapsed:.2f}s, {self.fill_call_count} calls, {self.early_failures} early failures")
-            return result
         except FillTimeout:
             elapsed = time.time() - self.fill_start_time
             # print(f"    Aborted: {elapsed:.2f}s, {self.fill_call_count} calls, {self.early_failures} failures")
             return False
 
-    def _fill_grid_recursive(self, grid, depth=0):
-        """Recursive backtracking with depth limit."""
-        
-        # Progress indicator every 100 calls
-        # if depth % 50 == 0 and depth > 0:
-        #     print(f"    Backtracking depth: {depth}")
-        
-        # Safety limit - if we go this deep, the layout is probably unsolvable
-        self.fill_call_count += 1
-    
-        # Print progress every 500 calls
-        # if self.fill_call_count % 500 == 0:
-        #     print(f"      [{self.fill_call_count} calls, depth {depth}]")
-        
-        cell = grid.find_best_empty_cell()
-        if cell is None:
-            return True
+        if result:
+            for idx, bit in enumerate(bits):
+                grid.cells[idx // grid.cols][idx % grid.cols].value = bit.bit_length()
+        return result
 
-        candidates = grid.get_candidates_for_cell(cell)
-        
-        # Track patterns
-        if not candidates:
-            self.early_failures += 1
-            if self.early_failures > 100:
-                if self.verbose:
-                    print(f"      Aborting: 100 early failures")
-                raise FillTimeout(f"100+ early failures")
-                # return False
-            return False
-        
-        # NEW: Print when we're at specific depths with info
-        if depth >55:
-            num_empty = sum(1 for r in range(grid.rows) for c in range(grid.cols) 
-                        if grid.cells[r][c].value is None)
-            # print(f"      Depth {depth}: {num_empty} cells remaining, trying {len(candidates)} candidates at ({cell.row},{cell.col})")
-        
-        candidates_list = list(candidates)
-        random.shuffle(candidates_list)
+    def _flatten_grid(self, grid):
+        """Build the flat per-cell lists used by the fill backtracking.
 
-        for value in candidates_list:
-            cell.value = value
-            
-            if self._fill_grid_recursive(grid, depth + 1):
+        Cells are indexed row-major (idx = row * cols + col).
+
+        Args:
+            grid: the Grid to flatten
+        Returns:
+            (bits, full_masks, blockers) where
+                bits[idx] is the value bit of the cell (0 = empty),
+                full_masks[idx] has one bit per value 1..group.size,
+                blockers[idx] is a tuple of the indices of every group peer
+                and neighbor, i.e. all cells that cannot share its value
+        """
+        if grid.neighbor_idx is None:
+            grid.index_cells()
+
+        bits = []
+        full_masks = []
+
+        for cell in (cell for row in grid.cells for cell in row):
+            bits.append(0 if cell.value is None else 1 << (cell.value - 1))
+            full_masks.append(grid.get_group(cell).all_mask)
+
+        return bits, full_masks, grid.blocker_idx
+
+    def _fill_flat(self, bits, full_masks, blockers):
+        """Iterative backtracking over the flat lists from _flatten_grid.
+
+        Uses an explicit stack instead of recursion: one entry per
+        assigned cell, holding its values in a random try order. Each loop
+        iteration is one search node (counted in fill_call_count).
+        """
+        stack = []      # (cell index, value bits in try order), deepest cell last
+        positions = []  # positions[k] = how many bits of stack[k] were tried
+
+        while True:
+            self.fill_call_count += 1
+
+            idx, candidates = self._pick_fill_cell(bits, full_masks, blockers)
+            if idx < 0:
                 return True
-            
-            cell.value = None
-        
-        return False
+
+            if candidates:
+                if candidates.bit_count() <= MAX_PERMUTED_VALUES:
+                    order = random.choice(_value_orders(candidates))
+                else:
+                    order = _mask_bits(candidates)
+                    random.shuffle(order)
+                stack.append((idx, order))
+                positions.append(0)
+            else:
+                # Track patterns
+                self.early_failures += 1
+                if self.early_failures > 100:
+                    if self.verbose:
+                        print(f"      Aborting: 100 early failures")
+                    raise FillTimeout(f"100+ early failures")
+
+            # Assign the next untried value, undoing exhausted cells on the way up
+            while stack:
+                idx, order = stack[-1]
+                pos = positions[-1]
+                if pos < len(order):
+                    bits[idx] = order[pos]
+                    positions[-1] = pos + 1
+                    break
+                bits[idx] = 0
+                stack.pop()
+                positions.pop()
+            else:
+                return False
+
+    def _pick_fill_cell(self, bits, full_masks, blockers):
+        """MRV: return (idx, candidate mask) of the emptiest cell.
+
+        The scan stops at the first cell with at most one candidate:
+        a forced (or dead) cell is as good a pick as any, and most nodes
+        have one, so the rest of the grid is rarely scanned.
+        Returns (-1, 0) when every cell is filled.
+        """
+        idx = -1
+        candidates = 0
+        min_candidates = 1 << 30
+        for i in range(len(bits)):
+            if bits[i]:
+                continue
+            used = 0
+            for j in blockers[i]:
+                used |= bits[j]
+            mask = full_masks[i] & ~used
+            count = mask.bit_count()
+            if count < min_candidates:
+                idx, candidates, min_candidates = i, mask, count
+                if count <= 1:
+                    break
+        return idx, candidates
     
     def _remove_clues(self, grid: Grid, solution, target_difficulty, removal_percentage=1.0):
-        """Remove clues one by one while preserving unique solvability.
+        """Remove clues in batches while preserving unique solvability.
 
-        Shuffles all filled cells, then for each: tentatively removes
-        its value, checks if the solver can still find a unique solution
-        at target_difficulty. Keeps it removed if yes, restores if no.
+        Shuffles all filled cells, then walks them in order: tentatively
+        removes the next batch of values, checks if the solver can still
+        find a unique solution at target_difficulty. Keeps them removed
+        if yes, restores them if no.
+        A single logical solve answers both questions (see below), so no
+        separate uniqueness search is run.
         
         This is the bottleneck — each removal tests uniqueness which
-        requires running the solver with backtracking.
+        requires running the solver with backtracking. The solver runs
+        in place on one scratch copy whose values are reset from grid
+        before each try, instead of cloning the grid per clue.
+
+        Clues are tried in batches: a whole batch is removed and checked
+        with one solve. The batch size doubles while every batch succeeds
+        (early removals are almost always fine) and halves on each
+        failure, bisecting a bad batch down to the clue that must stay.
+        After the first failure it never grows again, since removals
+        keep getting harder.
+
+        grid keeps the initial candidates of its empty cells up to date
+        as clues come and go, so each try only copies them over instead
+        of recomputing every cell from scratch.
 
         Args:
             grid: the filled solution grid (will be mutated)
             solution: untouched copy of the solution for reference
-            target_difficulty: solver max level for uniqueness check (not used yet)
+            target_difficulty: solver max level for the uniqueness check
             removal_percentage: 
                 0.0-1.0, what fraction of clues to try removing
                 1.0 = remove as many as possible
@@ -205,7 +365,8 @@ class Generator:
             the same grid with as many clues removed as possible
         """
 
-        solver = Solver()
+        solver = self.solver
+        work = grid.clone()  # scratch grid the solver is allowed to overwrite
         filled_cells = []
         
         for r in range(grid.rows):
@@ -218,25 +379,66 @@ class Generator:
         total_cells = len(filled_cells)
         max_removals = int(total_cells * removal_percentage)  # ← New limit
         removed_count = 0
-        for i, cell in enumerate(filled_cells):
+        batch_size = 4
+        growing = True  # cleared by the first failed batch
+        pos = 0  # filled_cells[:pos] are settled (removed or kept)
+        while pos < total_cells:
             if removed_count >= max_removals:  # ← Early stop
                 if self.verbose:
                     print(f"  Reached removal limit ({max_removals}), stopping")
                 break
-            if (i + 1) % 5 == 0:
-                if self.verbose:
-                    print(f"  Checking clue {i+1}/{total_cells} (removed so far: {removed_count})")
+            if self.verbose:
+                print(f"  Checking clue {pos+1}/{total_cells} (removed so far: {removed_count}, batch {batch_size})")
             
-            val = cell.value
-            cell.value = None
+            # Speculatively remove a whole batch and check it once
+            batch = filled_cells[pos:pos + min(batch_size, max_removals - removed_count)]
+            saved = [cell.value for cell in batch]
+            for cell in batch:
+                cell.value = None
+            for cell in batch:
+                self._refresh_candidates(grid, cell)
+            work.set_values(grid.get_values())
+            work.set_candidates(grid.get_candidates())
 
-            # Check both: solvable at difficulty AND unique
-            result = solver.solve(grid.clone(), max_difficulty=target_difficulty)
+            # Solvable at difficulty means unique too: the techniques only make
+            # deductions valid in every solution, and grid still admits the
+            # original one, so a full logical solve can only reach that one.
+            result = solver.solve_in_place(work, max_difficulty=target_difficulty,
+                                           init_candidates=False)
             
-            if result.solved and solver.has_unique_solution(grid):
-                removed_count += 1  # keep removed
-            else:
+            if result.solved:
+                removed_count += len(batch)  # keep removed
+                pos += len(batch)
+                if growing:
+                    batch_size = min(batch_size * 2, MAX_REMOVAL_BATCH)
+                continue
+
+            for cell, val in zip(batch, saved):
                 cell.value = val  # restore
+            for cell in batch:
+                self._refresh_candidates(grid, cell)
+
+            if len(batch) == 1:
+                pos += 1  # this clue is needed, keep it
+            # Retry the failed cells in smaller batches (down to one at a time)
+            batch_size = max(1, len(batch) // 2)
+            growing = False
                 
         # print(f"  Finished: removed {removed_count}/{total_cells} clues")
-        return grid
\ No newline at end of file
+        return grid
+
+    def _refresh_candidates(self, grid, cell):
+        """Recompute initial candidates around a cell whose value changed.
+
+        Only the cell itself, its group peers and its neighbors can be
+        affected by a single value change.
+
+        Args:
+            grid: the grid being reduced
+            cell: the Cell that was just cleared or restored
+        """
+        for other in (cell,) + grid.get_group_peers(cell) + grid.get_neighbors(cell):
+            if other.value is None:
+                other.candidates_mask = grid.get_candidate_mask(other)
+            else:
+                other.candidates_mask = 0
@@ -1,4 +1,23 @@
 import random
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _adjacent_pairs(rows, cols):
+    """Return every orthogonally adjacent cell pair as flat indices.
+
+    Each pair is (a, b) with idx = row * cols + col, ready to index the
+    union-find parent list. Only depends on the grid shape, so repeated
+    generation at one size (retries, batch runs) builds it once.
+    """
+    pairs = []
+    for r in range(rows):
+        for c in range(cols - 1):
+            pairs.append((r * cols + c, r * cols + c + 1))
+    for r in range(rows - 1):
+        for c in range(cols):
+            pairs.append((r * cols + c, (r + 1) * cols + c))
+    return tuple(pairs)
 
 
 class GroupGenerator:
@@ -26,12 +45,16 @@ class GroupGenerator:
 
         Algorithm:
             1. Start with each cell as its own group (unique ID)
-            2. Build list of all adjacent orthogonal cell pairs
+            2. Build list of all adjacent orthogonal cell pairs (flat indices)
             3. Shuffle the pair list for randomness
             4. For each pair: merge their groups if merged size <= max
             5. Repeat pass to merge any group still below min size
             6. Return the 2D group ID layout
 
+        Groups are tracked with a union-find over flat cell indices
+        (idx = row * cols + col), so a merge costs near O(1) instead
+        of a full layout scan. A group's ID is the index of its root cell.
+
         Args:
             rows: number of rows
             cols: number of columns
@@ -42,38 +65,24 @@ class GroupGenerator:
         """
         # print(f"Generating group layout for {rows}x{cols}...")
         
-        layout = []
-        for r in range(rows):
-            row = []
-            for c in range(cols):
-                group_id = r * cols + c  # unique ID per cell
-                row.append(group_id)
-            layout.append(row)
+        # Each cell starts as its own group: parent[idx] == idx
+        parent = list(range(rows * cols))
+        group_sizes = {gid: 1 for gid in parent}
+        group_neighbors = {gid: set() for gid in parent}
         
-        pairs = []
-        for r in range(rows):
-            for c in range(cols - 1):
-                pairs.append(((r, c), (r, c + 1)))
-        for r in range(rows - 1):
-            for c in range(cols):
-                pairs.append(((r, c), (r + 1, c)))
+        pairs = list(_adjacent_pairs(rows, cols))  # copy, shuffled below
+
+        # Adjacency between the initial single-cell groups
+        for a, b in pairs:
+            group_neighbors[a].add(b)
+            group_neighbors[b].add(a)
         
         random.shuffle(pairs)
 
-        # First we need to track group sizes
-        group_sizes = {}
-        for r in range(rows):
-            for c in range(cols):
-                gid = layout[r][c]
-                group_sizes[gid] = group_sizes.get(gid, 0) + 1
-        
         # Now process pairs
         for (cell_a, cell_b) in pairs:
-            r1, c1 = cell_a
-            r2, c2 = cell_b
-            
-            group_a = layout[r1][c1]
-            group_b = layout[r2][c2]
+            group_a = self._find(parent, cell_a)
+            group_b = self._find(parent, cell_b)
             
             if group_a == group_b:
                 continue  # already same group
@@ -85,9 +94,7 @@ class GroupGenerator:
                 if group_sizes[group_a] < group_sizes[group_b]:
                     group_a, group_b = group_b, group_a  # swap so we merge b into a
                 
-                self._merge_groups(layout, group_a, group_b)
-                group_sizes[group_a] += group_sizes[group_b]
-                group_sizes[group_b] = 0  # group_b no longer exists
+                self._merge_groups(parent, group_sizes, group_neighbors, group_a, group_b)
 
         # Find all groups still below min_size
         MAX_ITERATIONS = rows * cols
@@ -95,7 +102,7 @@ class GroupGenerator:
         iterations = 0
         while True:
             small_groups = [gid for gid, size in group_sizes.items() 
-                            if size > 0 and size < self.min_size]
+                            if size < self.min_size]
             
             if not small_groups:
                 break  # success
@@ -105,40 +112,104 @@ class GroupGenerator:
                 # Generation failed, return None to signal caller to retry
                 return None
             
+            merges = 0
             for small_gid in small_groups:
-                neighbors = self._get_adjacent_groups(small_gid, layout, rows, cols)
+                if small_gid not in group_sizes:
+                    continue  # already merged away earlier in this pass
+
+                neighbors = group_neighbors[small_gid]
                 
                 if not neighbors:
                     continue
                 
                 smallest_neighbor = min(neighbors, key=lambda gid: group_sizes[gid])
-                self._merge_groups(layout, smallest_neighbor, small_gid)
-                group_sizes[smallest_neighbor] += group_sizes[small_gid]
-                group_sizes[small_gid] = 0
+                self._merge_groups(parent, group_sizes, group_neighbors, smallest_neighbor, small_gid)
+                merges += 1
+
+            if merges == 0:
+                # Nothing could merge, so later passes would not either
+                return None
+
+        layout = []
+        for r in range(rows):
+            row = []
+            for c in range(cols):
+                row.append(self._find(parent, r * cols + c))
+            layout.append(row)
 
         return layout
 
-    def _merge_groups(self, layout, group_a, group_b):
-        """Merge group_b into group_a in the layout.
+    def generate_batch(self, n, rows, cols):
+        """Try up to n layouts for one grid size, stopping at the first success.
 
-        Replaces all occurrences of group_b ID with group_a ID
-        in the 2D layout array.
+        Generation can fail (see generate), so callers retry. Retries
+        share the cached per-shape _adjacent_pairs table, so only the
+        first attempt at a size builds it.
 
         Args:
-            layout: 2D list of group IDs (mutated in place)
-            group_a: the group ID to merge into (survives)
-            group_b: the group ID to merge from (disappears)
+            n: maximum number of attempts
+            rows: number of rows
+            cols: number of columns
+        Returns:
+            (layout, attempts): the first successful layout, or None if
+            all n attempts failed, and the number of attempts made
         """
-        for row in range(len(layout)):
-            for col in range(len(layout[0])):
-                if layout[row][col] == group_b:
-                    layout[row][col] = group_a
+        for attempt in range(1, n + 1):
+            layout = self.generate(rows, cols)
+            if layout is not None:
+                return layout, attempt
+        return None, n
+
+    def _find(self, parent, idx):
+        """Return the root cell index of the group containing idx.
+
+        Applies path halving so later lookups on the same chain are fast.
+
+        Args:
+            parent: union-find parent list (mutated in place)
+            idx: flat cell index
+        Returns:
+            the root index, which is also the group ID
+        """
+        while parent[idx] != idx:
+            parent[idx] = parent[parent[idx]]
+            idx = parent[idx]
+        return idx
+
+    def _merge_groups(self, parent, group_sizes, group_neighbors, group_a, group_b):
+        """Merge group_b into group_a.
+
+        Re-roots group_b under group_a, adds its size to group_a and
+        moves its adjacency over so every neighbor now points at group_a.
+
+        Args:
+            parent: union-find parent list (mutated in place)
+            group_sizes: dict of root ID -> size (mutated in place)
+            group_neighbors: dict of root ID -> set of adjacent root IDs
+                (mutated in place)
+            group_a: the root ID to merge into (survives)
+            group_b: the root ID to merge from (disappears)
+        """
+        parent[group_b] = group_a
+        group_sizes[group_a] += group_sizes.pop(group_b)
+
+        b_neighbors = group_neighbors.pop(group_b)
+        for gid in b_neighbors:
+            if gid != group_a:
+                group_neighbors[gid].discard(group_b)
+                group_neighbors[gid].add(group_a)
+        group_neighbors[group_a] |= b_neighbors
+        group_neighbors[group_a].discard(group_a)
+        group_neighbors[group_a].discard(group_b)
 
     def _is_connected(self, cells):
         """Return True if all cells form a connected region.
 
-        Uses BFS over orthogonal neighbors only — diagonal
-        connections do not count for group connectivity.
+        Flood fill over orthogonal neighbors only — diagonal
+        connections do not count for group connectivity. Cells are
+        removed from the unvisited set as soon as they are reached, so
+        each one is pushed at most once and no separate visited set is
+        needed.
 
         Args:
             cells: list of (row, col) tuples
@@ -148,63 +219,19 @@ class GroupGenerator:
         if not cells:
             return True
         
-        cells_set = set(cells)
-        visited = set()
-        queue = [cells[0]]
+        unvisited = set(cells)
+        if len(unvisited) != len(cells):
+            return False  # duplicated cells can never all be "visited"
+
+        unvisited.discard(cells[0])
+        stack = [cells[0]]
         
-        while queue:
-            current = queue.pop(0)
-            
-            if current in visited:
-                continue
-            
-            visited.add(current)
-            
-            row, col = current
+        while stack:
+            row, col = stack.pop()
             # check all 4 orthogonal directions
-            neighbors = [
-                (row - 1, col),  # up
-                (row + 1, col),  # down
-                (row, col - 1),  # left
-                (row, col + 1),  # right
-            ]
-            
-            for neighbor in neighbors:
-                if neighbor in cells_set and neighbor not in visited:
-                    queue.append(neighbor)
+            for neighbor in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+                if neighbor in unvisited:
+                    unvisited.discard(neighbor)
+                    stack.append(neighbor)
         
-        return len(visited) == len(cells)
-
-    def _get_adjacent_groups(self, group_id, layout, rows, cols):
-        """Return IDs of all groups that share an edge with this group.
-
-        Scans all cells belonging to group_id, checks their
-        orthogonal neighbors, collects any different group IDs found.
-
-        Args:
-            group_id: the group whose neighbors we want
-            layout: current 2D group ID array
-            rows, cols: grid dimensions for bounds checking
-        Returns:
-            set of group ID integers (excludes group_id itself)
-        """
-        groups = set()
-
-        for row in range(len(layout)):
-            for col in range(len(layout[0])):
-                if layout[row][col] == group_id:
-                    
-                    neighbors = [
-                        (row - 1, col),  # up
-                        (row + 1, col),  # down
-                        (row, col - 1),  # left
-                        (row, col + 1),  # right
-                    ]
-                    
-                    for (x, y) in neighbors:
-                        # bounds check
-                        if 0 <= x < len(layout) and 0 <= y < len(layout[0]):
-                            if layout[x][y] != group_id:
-                                groups.add(layout[x][y])
-
-        return groups
\ No newline at end of file
+        return not unvisited
@@ -1,4 +1,6 @@
+import multiprocessing
 import os
+import random
 
 from generator import Generator
 from models import Cell
@@ -32,7 +34,8 @@ def main():
                          min_group_size=MIN_GROUP_SIZE,
                          seed=SEED,
                          removal_percentage=REM_PERCENT,
-                         verbose=VERBOSE)
+                         verbose=VERBOSE,
+                         workers=os.cpu_count())
     
     if puzzle is None:
         print("Failed to generate puzzle")
@@ -62,32 +65,51 @@ def main():
         draw_grid(loaded_puzzle)
 
 
-def batch_generate():
-    """Generate multiple puzzles and save to JSON files."""
+def _generate_one(i):
+    """Generate and save puzzle number i. Runs inside a worker process.
+
+    Each call builds its own Generator so nothing is shared between
+    workers. With a fixed SEED, puzzle i always uses SEED + i.
+
+    Returns:
+        (i, filepath) on success, (i, None) if generation failed
+    """
+    if SEED is None:
+        random.seed()  # forked workers would otherwise share the parent's RNG state
+    seed = SEED + i if SEED is not None else None
+
     gen = Generator()
+    grid = gen.generate(ROWS, COLS,
+                        difficulty=DIFF, 
+                        max_group_size=MAX_GROUP_SIZE,
+                        min_group_size=MIN_GROUP_SIZE,
+                        seed=seed,
+                        removal_percentage=REM_PERCENT,
+                        verbose=VERBOSE)
+    
+    if grid is None:
+        return i, None
 
+    # Save to numbered file
+    filepath = os.path.join(DIR, f"puzzle_{i+1:03d}.json")
+    save_puzzle(grid, filepath)
+    return i, filepath
+
+
+def batch_generate():
+    """Generate multiple puzzles in parallel and save to JSON files."""
     os.makedirs(DIR, exist_ok=True)
     successes = 0
+
+    print(f"Generating {COUNT} puzzles on {os.cpu_count()} processes...")
     
-    for i in range(COUNT):
-        print(f"\n=== Generating puzzle {i+1}/{COUNT} ===")
-        
-        grid = gen.generate(ROWS, COLS,
-                            difficulty=DIFF, 
-                            max_group_size=MAX_GROUP_SIZE,
-                            min_group_size=MIN_GROUP_SIZE,
-                            seed=SEED,
-                            removal_percentage=REM_PERCENT,
-                            verbose=VERBOSE)
-        
-        if grid is not None:
-            # Save to numbered file
-            filepath = os.path.join(DIR, f"puzzle_{i+1:03d}.json")
-            save_puzzle(grid, filepath)
-            print(f"  Saved to {filepath}")
-            successes += 1
-        else:
-            print(f"  Failed to generate")
+    with multiprocessing.Pool(os.cpu_count()) as pool:
+        for i, filepath in pool.imap_unordered(_generate_one, range(COUNT)):
+            if filepath is not None:
+                print(f"  Puzzle {i+1}/{COUNT}: saved to {filepath}")
+                successes += 1
+            else:
+                print(f"  Puzzle {i+1}/{COUNT}: failed to generate")
     
     print(f"\n=== Complete: {successes}/{COUNT} puzzles generated ===")
 
@@ -1,7 +1,9 @@
-from random import randint
 from typing import List
 
+
 class Cell:
+    __slots__ = ("row", "col", "idx", "value", "candidates_mask", "group_id", "group")
+
     def __init__(self, row, col, group_id, value=None):
         """Create a cell at (row, col) belonging to group_id.
 
@@ -13,9 +15,32 @@ class Cell:
         """
         self.row = row
         self.col = col
+        self.idx = None              # flat row-major index, set once the grid indexes its cells
         self.value = value
-        self.candidates = set()
+        self.candidates_mask = 0     # remaining possible values, bit (v - 1) = v
         self.group_id = group_id
+        self.group = None            # the Group itself, set once the grid links its cells
+
+    def get_candidate_values(self):
+        """Return the remaining candidate values in ascending order.
+
+        Decodes candidates_mask, where bit (v - 1) set means value v is
+        still possible, so 0b101 -> [1, 3].
+        """
+        values = []
+        mask = self.candidates_mask
+        while mask:
+            low = mask & -mask
+            values.append(low.bit_length())
+            mask ^= low
+        return values
+
+    def set_candidate_values(self, values):
+        """Set candidates_mask from an iterable of values ([1, 3] -> 0b101)."""
+        mask = 0
+        for v in values:
+            mask |= 1 << (v - 1)
+        self.candidates_mask = mask
     
     def __str__(self):
         return "(" + str(self.row) + ", " + str(self.col) + ", " + str(self.value) + ")"
@@ -35,6 +60,7 @@ class Group:
         """
         self.id = id
         self.size = size
+        self.all_mask = (1 << size) - 1    # candidate bitmask with every value 1..size
         self.cells : List[Cell] = []
 
     def __str__(self):
@@ -61,7 +87,17 @@ class Grid:
         self.cols = mcols
         self.cells : List[List[Cell]] = []     # 2D list: self.cells[row][col] = Cell
         self.groups : List[Group] = []    # flat list of Group objects
+        self.groups_by_id : dict = None   # group id -> Group
         self.solution : List[List[Cell]] = None
+        # Flat row-major indices (idx = row * cols + col), set by index_cells()
+        self.neighbor_idx : tuple = None           # neighbor_idx[idx] = indices of its neighbors
+        self.group_cells_idx : dict = None         # group id -> indices of its cells
+        self.blocker_idx : tuple = None            # blocker_idx[idx] = sorted peer + neighbor indices
+        self.neighbor_bits : tuple = None          # neighbor_bits[idx] = int with bit j set per neighbor j
+        self.adjacent_pairs : tuple = None         # every adjacent (i, j) pair once, with i < j
+        # Same layout, but Cell/Group references, set by link_cells()
+        self.neighbor_cells : list = None          # neighbor_cells[idx] = tuple of neighbor Cells
+        self.peer_cells : list = None              # peer_cells[idx] = tuple of group peer Cells
 
     def __str__(self):
         result = ""
@@ -103,18 +139,105 @@ class Grid:
             for c in range(self.cols):
                 gid = group_map[r][c]
                 cell = Cell(r, c, gid, value=None)
+                cell.group = groups_dict[gid]
                 groups_dict[gid].cells.append(cell)
                 row_cells.append(cell)
             self.cells.append(row_cells)
+
+        self.groups_by_id = groups_dict
+        self.index_cells()
+        self.link_cells()
     
     # print("    Cells built successfully")
 
+    def index_cells(self):
+        """Precompute flat neighbor, group-member and blocker index tuples.
+
+        Also stamps every cell with its flat index (cell.idx), so lookups
+        into these tables skip the row * cols + col arithmetic.
+        Adjacency and group membership never change once cells are
+        built, so hot loops that work on flat per-cell lists (like the
+        generator's fill) can read these instead of walking Cell objects.
+        Called by build_cells; grids assembled by hand can call it once
+        their cells and groups are in place.
+        """
+        rows = self.rows
+        cols = self.cols
+        # Same neighbor order as Grid.get_neighbors: row offsets -1..1, then column offsets
+        neighbor_idx = []
+        for r in range(rows):
+            for c in range(cols):
+                neighbors = []
+                for i in range(-1, 2):
+                    for j in range(-1, 2):
+                        if (i or j) and 0 <= r + i < rows and 0 <= c + j < cols:
+                            neighbors.append((r + i) * cols + (c + j))
+                neighbor_idx.append(tuple(neighbors))
+        self.neighbor_idx = tuple(neighbor_idx)
+
+        # Neighbors as bitsets over flat indices: the cells adjacent to all
+        # of a, b, c are neighbor_bits[a] & neighbor_bits[b] & neighbor_bits[c]
+        neighbor_bits = []
+        for neighbors in self.neighbor_idx:
+            bits = 0
+            for j in neighbors:
+                bits |= 1 << j
+            neighbor_bits.append(bits)
+        self.neighbor_bits = tuple(neighbor_bits)
+
+        # Each adjacent pair once, from its lower index, for is_valid's flat scan
+        pairs = []
+        for idx in range(len(self.neighbor_idx)):
+            for j in self.neighbor_idx[idx]:
+                if j > idx:
+                    pairs.append((idx, j))
+        self.adjacent_pairs = tuple(pairs)
+
+        for row in self.cells:
+            for cell in row:
+                cell.idx = cell.row * cols + cell.col
+
+        self.group_cells_idx = {}
+        for group in self.groups:
+            self.group_cells_idx[group.id] = tuple(c.idx for c in group.cells)
+
+        # Every cell that cannot share a value with idx: neighbors and group peers
+        blockers = []
+        for idx, cell in enumerate(cell for row in self.cells for cell in row):
+            others = set(self.neighbor_idx[idx])
+            others.update(self.group_cells_idx[cell.group_id])
+            others.discard(idx)
+            blockers.append(tuple(sorted(others)))
+        self.blocker_idx = tuple(blockers)
+
     def get_cell(self, row, col):
         """Return the Cell at position (row, col)."""
         return self.cells[row][col]
 
 
-    def get_neighbors(self, cell) -> list[Cell]:
+    def link_cells(self):
+        """Precompute each cell's neighbors, group peers and Group.
+
+        Stores flat row-major lists of Cell tuples, the group id -> Group
+        dict and a direct cell.group reference, so get_neighbors,
+        get_group_peers and get_group become a single lookup instead of
+        re-deriving the answer on every call. Built on first use, which
+        also covers grids assembled by hand.
+        """
+        if self.neighbor_idx is None:
+            self.index_cells()
+
+        flat = [cell for row in self.cells for cell in row]
+        self.groups_by_id = {group.id: group for group in self.groups}
+        for cell in flat:
+            cell.group = self.groups_by_id.get(cell.group_id)
+
+        self.neighbor_cells = [tuple(flat[j] for j in idxs) for idxs in self.neighbor_idx]
+        self.peer_cells = [
+            tuple(c for c in cell.group.cells if c is not cell) if cell.group else ()
+            for cell in flat]
+
+    def get_neighbors(self, cell) -> tuple[Cell, ...]:
         """Return all cells adjacent to this cell, including diagonals.
 
         Checks all 8 directions. Skips out-of-bounds positions.
@@ -124,28 +247,11 @@ class Grid:
         Args:
             cell: the Cell whose neighbors we want
         Returns:
-            list of Cell objects (between 3 and 8 depending on position)
+            tuple of Cell objects (between 3 and 8 depending on position)
         """
-
-        cellx = cell.row
-        celly = cell.col
-        neig = list(0 for i in range(8))
-
-        index = 0
-        oob = 0
-        for i in range(-1,2):
-            for j in range(-1,2):
-
-                if (cellx+i < 0 or cellx+i >= self.rows or celly+j < 0 or celly+j >= self.cols):
-                    oob += 1
-                    continue
-
-                if (i or j):
-                    neig[index] = self.cells[cellx+i][celly+j]
-                    index += 1
-        return neig[:8-oob]
-
-        
+        if self.neighbor_cells is None:
+            self.link_cells()
+        return self.neighbor_cells[cell.idx]
 
     def get_group(self, cell) -> Group:
         """Return the Group that this cell belongs to.
@@ -155,12 +261,13 @@ class Grid:
         Returns:
             the Group object whose id matches cell.group_id
         """
-        for group in self.groups:
-            if group.id == cell.group_id:
-                return group
-        return None  # shouldn't happen if grid is valid
+        group = cell.group
+        if group is None:
+            self.link_cells()
+            group = cell.group
+        return group
 
-    def get_group_peers(self, cell) -> list[Cell]: 
+    def get_group_peers(self, cell) -> tuple[Cell, ...]:
         """Return all other cells in the same group as this cell.
 
         Excludes the cell itself. These cells must all have
@@ -169,19 +276,11 @@ class Grid:
         Args:
             cell: the Cell whose group peers we want
         Returns:
-            list of Cell objects in the same group, excluding cell itself
+            tuple of Cell objects in the same group, excluding cell itself
         """
-        group = self.get_group(cell)
-        others = list(0 for i in range(group.size-1))
-
-        index = 0
-        for c in group.cells:
-            if c is not cell:
-                others[index] = c
-                index += 1
-        return others
-
-
+        if self.peer_cells is None:
+            self.link_cells()
+        return self.peer_cells[cell.idx]
 
     def is_complete(self):
         """Return True if every cell has a non-None value."""
@@ -198,18 +297,22 @@ class Grid:
         """
         # Rule 1 — no duplicate values in any group
         for group in self.groups:
-            vals = [c.value for c in group.cells if c.value is not None]
-            if len(vals) != len(set(vals)):
-                return False
+            seen = 0
+            for c in group.cells:
+                if c.value is not None:
+                    bit = 1 << (c.value - 1)
+                    if seen & bit:
+                        return False
+                    seen |= bit
 
         # Rule 2 — no two neighbors share the same value
-        for row in self.cells:
-            for cell in row:
-                if cell.value is not None:
-                    neighbor_vals = [n.value for n in self.get_neighbors(cell) 
-                                    if n.value is not None]
-                    if cell.value in neighbor_vals:
-                        return False
+        # Each adjacent pair is compared once, from the precomputed pair list
+        if self.adjacent_pairs is None:
+            self.index_cells()
+        values = self.get_values()
+        for i, j in self.adjacent_pairs:
+            if values[i] == values[j] and values[i] is not None:
+                return False
 
         return True
 
@@ -219,42 +322,110 @@ class Grid:
         Used by the generator before backtracking and by the solver
         before trial-and-error, so the original is never mutated.
         """
+        if self.group_cells_idx is None:
+            self.index_cells()
+
         new_grid = Grid(self.rows, self.cols)
+        cols = self.cols
     
-        # Step 1 — copy all cells
-        for r in range(self.rows):
-            row = []
-            for c in range(self.cols):
-                old_cell = self.cells[r][c]
+        # Step 1 — copy all cells into one flat row-major list
+        flat = []
+        for row in self.cells:
+            for old_cell in row:
                 new_cell = Cell(old_cell.row, old_cell.col, old_cell.group_id, old_cell.value)
-                new_cell.candidates = set(old_cell.candidates)  # copy the set
-                row.append(new_cell)
-            new_grid.cells.append(row)
+                new_cell.idx = old_cell.idx
+                new_cell.candidates_mask = old_cell.candidates_mask
+                flat.append(new_cell)
+        new_grid.cells = [flat[r * cols:(r + 1) * cols] for r in range(self.rows)]
         
-        # Step 2 — rebuild groups pointing to new cells
+        # Step 2 — rebuild groups pointing to new cells, by flat index
+        new_grid.groups_by_id = {}
         for group in self.groups:
             new_group = Group(group.id, group.size)
-            for cell in group.cells:
-                new_group.cells.append(new_grid.cells[cell.row][cell.col])
+            new_group.cells = [flat[i] for i in self.group_cells_idx[group.id]]
+            for new_cell in new_group.cells:
+                new_cell.group = new_group
             new_grid.groups.append(new_group)
+            new_grid.groups_by_id[group.id] = new_group
+
+        # Structure is identical, so the index tuples can be shared
+        new_grid.neighbor_idx = self.neighbor_idx
+        new_grid.group_cells_idx = self.group_cells_idx
+        new_grid.blocker_idx = self.blocker_idx
+        new_grid.neighbor_bits = self.neighbor_bits
+        new_grid.adjacent_pairs = self.adjacent_pairs
         
         return new_grid
     
-    def get_candidates_for_cell(self, cell):
-        """Get valid values for a cell based on current grid state."""
+    def get_values(self):
+        """Return a flat row-major snapshot of every cell value.
+
+        Much cheaper than clone() when only the values need restoring
+        later, e.g. around a trial solve.
+        """
+        return [cell.value for row in self.cells for cell in row]
+
+    def set_values(self, values):
+        """Restore cell values from a snapshot taken with get_values()."""
+        i = 0
+        for row in self.cells:
+            for cell in row:
+                cell.value = values[i]
+                i += 1
+
+    def get_candidates(self):
+        """Return a flat row-major snapshot of every cell's candidate mask."""
+        return [cell.candidates_mask for row in self.cells for cell in row]
+
+    def set_candidates(self, candidates):
+        """Restore candidate masks from a snapshot taken with get_candidates()."""
+        i = 0
+        for row in self.cells:
+            for cell in row:
+                cell.candidates_mask = candidates[i]
+                i += 1
+
+    def get_candidate_mask(self, cell):
+        """Return the valid values for a cell as a bitmask.
+
+        Bit (v - 1) is set when value v can still go in this cell based
+        on the current grid state. Used in the backtracking hot paths,
+        where building a set per call is the dominant cost.
+
+        Args:
+            cell: the (empty) Cell to check
+        Returns:
+            int bitmask over values 1..group.size
+        """
         cell_group = self.get_group(cell)
-        candidates = set(range(1, cell_group.size + 1))
-        
+        used = 0
+
         for peer in self.get_group_peers(cell):
-            candidates.discard(peer.value)
-        
+            if peer.value is not None:
+                used |= 1 << (peer.value - 1)
+
         for neigh in self.get_neighbors(cell):
-            candidates.discard(neigh.value)
-        
-        return candidates
+            if neigh.value is not None:
+                used |= 1 << (neigh.value - 1)
+
+        return cell_group.all_mask & ~used
+
+    def get_candidates_for_cell(self, cell):
+        """Get valid values for a cell based on current grid state."""
+        mask = self.get_candidate_mask(cell)
+        values = set()
+        for v in range(1, mask.bit_length() + 1):
+            if mask & (1 << (v - 1)):
+                values.add(v)
+        return values
 
     def find_best_empty_cell(self):
-        """Find empty cell with fewest candidates (MRV heuristic)."""
+        """Find empty cell with fewest candidates (MRV heuristic).
+
+        Stops at the first cell with at most one candidate: a forced
+        cell is always worth taking, and if a dead cell exists elsewhere
+        the search still reaches it one step later.
+        """
         best_cell = None
         min_candidates = float('inf')
         
@@ -265,19 +436,12 @@ class Grid:
                 if cell.value is not None:
                     continue
                 
-                candidates = self.get_candidates_for_cell(cell)
-                num_candidates = len(candidates)
+                num_candidates = self.get_candidate_mask(cell).bit_count()
                 
                 if num_candidates < min_candidates:
                     min_candidates = num_candidates
                     best_cell = cell
+                    if num_candidates <= 1:
+                        return best_cell  # forced or dead end, stop scanning
         
         return best_cell
-
-
-
-
-
-
-
-
@@ -1,97 +1,56 @@
 import json
 from models import Grid
-from difficulty import rate
+
+
+def _write_rows(f, name, rows, last=False):
+    """Write one 2D array field, each row on its own line.
+
+    Rows are serialized as they are produced, so no full 2D copy of the
+    grid is held in memory first.
+
+    Args:
+        f: open text file
+        name: JSON key to write
+        rows: iterable of row lists
+        last: True for the final field (no trailing comma)
+    """
+    f.write(f'  "{name}": [')
+    sep = "\n"
+    for row in rows:
+        f.write(f'{sep}    {json.dumps(row)}')
+        sep = ",\n"
+    f.write('\n  ]\n' if last else '\n  ],\n')
 
 def save_puzzle(grid, filepath):
     """Save a puzzle grid to JSON file.
     
+    Writes rows, cols, groups, layout, puzzle and solution (null if the
+    grid has none), one grid row per line for readability.
+
     Args:
         grid: Grid object with cells filled (the puzzle state)
         filepath: where to save
     """
-def save_puzzle(grid, filepath):
-    """Save a puzzle grid to JSON file."""
-    
-    # Build groups list
-    groups_data = []
-    for group in grid.groups:
-        groups_data.append({
-            "id": group.id,
-            "size": group.size
-        })
-    
-    # Build layout (2D array of group IDs)
-    layout = []
-    for r in range(grid.rows):
-        row = []
-        for c in range(grid.cols):
-            row.append(grid.cells[r][c].group_id)
-        layout.append(row)
-    
-    # Build puzzle (current values)
-    puzzle = []
-    for r in range(grid.rows):
-        row = []
-        for c in range(grid.cols):
-            row.append(grid.cells[r][c].value)
-        puzzle.append(row)
-    
-    # Build solution (if exists)
-    solution = None
-    if hasattr(grid, 'solution') and grid.solution is not None:
-        solution = []
-        for row in grid.solution.cells:  # ← Extract from the Grid's cells
-            solution.append([cell.value for cell in row])
-    
-    # Combine into dictionary
-    data = {
-        "rows": grid.rows,
-        "cols": grid.cols,
-        "groups": groups_data,
-        "layout": layout,
-        "puzzle": puzzle,
-        "solution": solution
-    }
+    solution = getattr(grid, 'solution', None)
 
-    data["difficulty"] = rate(grid)
-    
     # Custom formatting: write manually for readable grids
     with open(filepath, 'w') as f:
         f.write("{\n")
-        f.write(f'  "rows": {data["rows"]},\n')
-        f.write(f'  "cols": {data["cols"]},\n')
+        f.write(f'  "rows": {grid.rows},\n')
+        f.write(f'  "cols": {grid.cols},\n')
         
         # Groups
-        f.write('  "groups": [\n')
-        for i, g in enumerate(data["groups"]):
-            comma = "," if i < len(data["groups"]) - 1 else ""
-            f.write(f'    {json.dumps(g)}{comma}\n')
-        f.write('  ],\n')
-        
-        # Layout - each row on one line
-        f.write('  "layout": [\n')
-        for i, row in enumerate(data["layout"]):
-            comma = "," if i < len(data["layout"]) - 1 else ""
-            f.write(f'    {json.dumps(row)}{comma}\n')
-        f.write('  ],\n')
+        _write_rows(f, "groups", ({"id": group.id, "size": group.size} for group in grid.groups))
         
-        # Puzzle - each row on one line
-        f.write('  "puzzle": [\n')
-        for i, row in enumerate(data["puzzle"]):
-            comma = "," if i < len(data["puzzle"]) - 1 else ""
-            f.write(f'    {json.dumps(row)}{comma}\n')
-        f.write('  ],\n')
+        # Layout (group IDs) and puzzle (current values) - each row on one line
+        _write_rows(f, "layout", ([cell.group_id for cell in row] for row in grid.cells))
+        _write_rows(f, "puzzle", ([cell.value for cell in row] for row in grid.cells))
         
         # Solution - each row on one line
-        f.write('  "solution": ')
-        if data["solution"] is None:
-            f.write('null\n')
+        if solution is None:
+            f.write('  "solution": null\n')
         else:
-            f.write('[\n')
-            for i, row in enumerate(data["solution"]):
-                comma = "," if i < len(data["solution"]) - 1 else ""
-                f.write(f'    {json.dumps(row)}{comma}\n')
-            f.write('  ]\n')
+            _write_rows(f, "solution", ([cell.value for cell in row] for row in solution.cells), last=True)
         
         f.write("}\n")
 
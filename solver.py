@@ -43,6 +43,51 @@ class Solver:
     def __init__(self):
         self.grid = None
         self.techniques_used = set()
+        self.group_version = {}   # group id -> bumped whenever one of its cells changes
+        self.group_seen = {}      # technique name -> {group id: version it last processed}
+
+    def reset(self):
+        """Forget the last puzzle so this solver can be reused.
+
+        solve() resets its own state on entry anyway; this just drops
+        the reference to the previous grid between runs.
+        """
+        self.grid = None
+        self.techniques_used = set()
+        self.group_version = {}
+        self.group_seen = {}
+
+    def _track_groups(self):
+        """Start change tracking for the current grid's groups.
+
+        Every mutation of a cell's value or candidates bumps its group's
+        version. The group techniques remember the version they last
+        processed each group at and skip groups that have not changed
+        since: their deductions only depend on the group's own cells (and
+        candidates only ever shrink), so rerunning them there is a no-op.
+        """
+        self.group_version = {group.id: 0 for group in self.grid.groups}
+        self.group_seen = {}
+
+    def _changed_groups(self, seen):
+        """Return the groups whose version differs from the one recorded in seen.
+
+        Only lists them: the calling technique marks each group as
+        processed (seen[group.id] = its version) when it starts on it, so
+        a change it makes to the group while processing brings the group
+        back on the next call.
+
+        Args:
+            seen: the technique's {group id: version} dict from group_seen
+        Returns:
+            list of Group objects, in grid order
+        """
+        version = self.group_version
+        changed = []
+        for group in self.grid.groups:
+            if seen.get(group.id) != version[group.id]:
+                changed.append(group)
+        return changed
 
     def solve(self, grid: Grid, max_difficulty=4):
         """Main entry point. Attempt to solve the given grid.
@@ -57,11 +102,32 @@ class Solver:
         Returns:
             SolveResult with solved=True if fully solved, False if stuck
         """
+        return self.solve_in_place(grid.clone(), max_difficulty)
+
+    def solve_in_place(self, grid: Grid, max_difficulty=4, init_candidates=True):
+        """Same as solve(), but works directly on grid instead of a clone.
+
+        The grid's values and candidates are overwritten. Meant for
+        callers that solve many variants of one puzzle and can restore
+        the values themselves (see Grid.get_values / set_values).
+
+        Args:
+            grid: the puzzle to solve (will be mutated)
+            max_difficulty: highest technique level allowed (1-4)
+            init_candidates: if False, the caller guarantees every empty
+                cell already holds its initial candidates (as computed by
+                Grid.get_candidate_mask) and the setup pass is skipped
+        Returns:
+            SolveResult whose grid is the given grid object
+        """
 
-        self.grid = grid.clone()
+        self.grid = grid
         self.techniques_used = set()
         
-        self._init_candidates()
+        if init_candidates:
+            self._init_candidates()
+        else:
+            self._track_groups()
         
         changed = True
         while changed:
@@ -105,75 +171,224 @@ class Solver:
         puzzles before keeping them.
 
         Args:
-            grid: the puzzle to check
+            grid: the puzzle to check (will not be mutated)
         Returns:
             True if exactly one solution exists, False otherwise
         """
-        cloned = grid.clone()
-        count = self._count_solutions(cloned, limit=2)
-        return count == 1
+        return self.count_solutions(grid.clone(), limit=2) == 1
 
-    def _count_solutions(self, grid, limit=2):
-        """Count solutions up to a limit using backtracking."""
-        if grid.is_complete():
-            return 1
-        
-        best_cell = grid.find_best_empty_cell()
-        
-        if best_cell is None:
+    def count_solutions(self, grid, max_difficulty=4, limit=2):
+        """Count solutions of a puzzle, stopping once limit is reached.
+
+        Clues that already break a rule give 0 straight away: the search
+        below only fills empty cells and never rechecks the clues.
+        Otherwise first applies the logical techniques up to max_difficulty,
+        which only make deductions that hold in every solution. Backtracking
+        then starts from that reduced state, so the search tree is far
+        smaller than backtracking from the raw clues.
+
+        Args:
+            grid: the puzzle to count (will be mutated, pass a clone)
+            max_difficulty: highest technique level used before searching
+            limit: stop counting once this many solutions are found
+        Returns:
+            number of solutions found, between 0 and limit
+        """
+        if not grid.is_valid():
+            return 0  # the clues themselves already break a rule
+
+        try:
+            result = self.solve_in_place(grid, max_difficulty)
+        except Contradiction:
+            return 0
+
+        if result.solved:
             return 1
-        
-        best_candidates = grid.get_candidates_for_cell(best_cell)
-        
-        # Try each candidate and count solutions
+        return self._count_solutions(grid, limit)
+
+    def _count_solutions(self, grid, limit=2):
+        """Count solutions up to a limit using backtracking.
+
+        The search runs on flat per-cell lists (value bits, candidate
+        masks and Grid.blocker_idx) rather than Cell objects, so each
+        node is plain integer work. The grid itself is left untouched.
+        """
+        if grid.blocker_idx is None:
+            grid.index_cells()
+        blockers = grid.blocker_idx
+
+        bits = []
+        for row in grid.cells:
+            for cell in row:
+                bits.append(0 if cell.value is None else 1 << (cell.value - 1))
+
+        cands = []
+        for idx, cell in enumerate(cell for row in grid.cells for cell in row):
+            used = 0
+            for j in blockers[idx]:
+                used |= bits[j]
+            cands.append(0 if bits[idx] else grid.get_group(cell).all_mask & ~used)
+
+        return self._count_flat(bits, cands, blockers, limit)
+
+    def _count_flat(self, bits, cands, blockers, limit):
+        """Iterative solution count over the lists built by _count_solutions.
+
+        Candidate masks are kept up to date as values are placed: every
+        mask a placement narrows is pushed on a trail as (idx, old mask,
+        old reasons) and restored when the search backs out, so no node
+        recomputes candidates from scratch. A placement that empties an
+        empty cell's mask is rejected on the spot (forward checking).
+
+        Each node picks an empty cell with the fewest candidates (MRV)
+        and tries its values in ascending order. Undecided empty cells sit
+        in buckets by candidate count, moved whenever their mask narrows or
+        is restored, so the pick is a look at the lowest non-empty bucket
+        instead of a scan of the whole grid. Counts are tracked alongside
+        the masks (each narrowing or restore moves them by exactly one),
+        so the search never recounts bits.
+
+        Dead ends backjump (conflict-directed backjumping): each cell
+        remembers which stack levels narrowed its mask, and a level whose
+        values all fail collects the levels responsible. The search then
+        returns straight to the deepest of them, skipping levels that had
+        no part in the failure. Levels with a solution below them back up
+        chronologically, so no solution is ever jumped over.
+        """
         total_count = 0
-        
-        for value in best_candidates:
-            best_cell.value = value
-            count = self._count_solutions(grid, limit)
-            total_count += count
-            
-            if total_count >= limit:
-                best_cell.value = None
-                return limit
-            
-            best_cell.value = None
-        
-        return total_count
+        stack = []    # (cell index, trail length before its placement), deepest last
+        untried = []  # untried[k] = value bits of stack[k] not tried yet
+        blamed = []   # blamed[k] = bitmask of earlier levels behind failures under stack[k]
+        trail = []    # (cell index, mask and reasons before a placement narrowed it)
+        reasons = [0] * len(bits)  # reasons[j] = bitmask of levels that narrowed cands[j]
+        solved = 0    # bitmask of levels with a solution somewhere below them
+
+        counts = [mask.bit_count() for mask in cands]  # counts[j] = candidates left in cands[j]
+
+        # buckets[k] = empty cells not on the stack with k candidates
+        buckets = [set() for _ in range(max(counts) + 1)]
+        for i in range(len(bits)):
+            if not bits[i]:
+                buckets[counts[i]].add(i)
+
+        def undo_to(mark):
+            """Pop the trail back to length mark, restoring each mask,
+            its reasons and its bucket."""
+            while len(trail) > mark:
+                j, mask, why = trail.pop()
+                count = counts[j]
+                buckets[count].discard(j)
+                buckets[count + 1].add(j)
+                counts[j] = count + 1
+                cands[j] = mask
+                reasons[j] = why
+
+        while True:
+            for bucket in buckets:
+                if bucket:
+                    best_idx = bucket.pop()
+                    break
+            else:
+                best_idx = -1
+
+            if best_idx < 0:
+                total_count += 1  # every cell filled: one solution
+                if total_count >= limit:
+                    return limit
+                solved = (1 << len(stack)) - 1
+            else:
+                stack.append((best_idx, len(trail)))
+                untried.append(cands[best_idx])
+                blamed.append(0)
+
+            # Place the next untried value, undoing exhausted cells on the way up
+            while stack:
+                level = len(stack) - 1
+                idx, mark = stack[-1]
+                undo_to(mark)
+                bits[idx] = 0
+
+                remaining = untried[-1]
+                if not remaining:
+                    stack.pop()
+                    untried.pop()
+                    buckets[counts[idx]].add(idx)
+                    level_bit = 1 << level
+                    culprits = (blamed.pop() | reasons[idx]) & (level_bit - 1)
+                    if solved & level_bit:
+                        solved ^= level_bit
+                        continue  # chronological: parent has a solution below too
+                    if not culprits:
+                        return total_count  # fails whatever the earlier levels hold
+
+                    # Jump back to the deepest culprit, dropping the levels in between
+                    target = culprits.bit_length() - 1
+                    while len(stack) > target + 1:
+                        j, mark = stack.pop()
+                        untried.pop()
+                        blamed.pop()
+                        undo_to(mark)
+                        bits[j] = 0
+                        buckets[counts[j]].add(j)
+                    solved &= (1 << (target + 1)) - 1
+                    blamed[target] |= culprits ^ (1 << target)
+                    continue
+                bit = remaining & -remaining
+                untried[-1] = remaining ^ bit
+
+                bits[idx] = bit
+                level_bit = 1 << level
+                for j in blockers[idx]:
+                    mask = cands[j]
+                    if mask & bit and not bits[j]:
+                        trail.append((j, mask, reasons[j]))
+                        count = counts[j]
+                        buckets[count].discard(j)
+                        buckets[count - 1].add(j)
+                        counts[j] = count - 1
+                        mask ^= bit
+                        cands[j] = mask
+                        if not mask:
+                            # dead cell: blame whoever else narrowed it, try the next value
+                            blamed[level] |= reasons[j]
+                            reasons[j] |= level_bit
+                            break
+                        reasons[j] |= level_bit
+                else:
+                    break  # placed, search below it
+            else:
+                return total_count
 
     def _init_candidates(self):
-        """Initialize candidate sets for all empty cells.
+        """Initialize candidate masks for all empty cells.
 
-        For each empty cell: start with {1..group_size},
-        then remove values already placed in its group,
-        then remove values present in any of its neighbors.
+        Every empty cell starts with its group's full mask (values
+        1..group_size). Then each placed value is swept once over the
+        cell's blockers (Grid.blocker_idx: group peers and neighbors),
+        clearing it from all of them in one pass. Work runs on a flat
+        list of masks that is written back to the cells at the end.
         Must be called once at the start before any technique.
         """
+        grid = self.grid
+        if grid.blocker_idx is None:
+            grid.index_cells()
+        blockers = grid.blocker_idx
 
-        cells = self.grid.cells
-        for r in range(self.grid.rows):
-            for c in range(self.grid.cols):
-                cell = cells[r][c]
-                if cell.value is None:
-                    cell_group = self.grid.get_group(cell)
-                    # init
-                    cell.candidates = set(range(1, cell_group.size + 1))
-                    # print(f"Cell ({r},{c}) group {cell.group_id} size {cell_group.size}, initial: {cell.candidates}")
-                    
-                    # remove group
-                    for peer in self.grid.get_group_peers(cell):
-                        if peer.value is not None:
-                            cell.candidates.discard(peer.value)
-                            # print(f"  Removed {peer.value} (from group)")
-                    
-                    # remove neighbors
-                    for neigh in self.grid.get_neighbors(cell):
-                        if neigh.value is not None:
-                            cell.candidates.discard(neigh.value)
-                            # print(f"  Removed {neigh.value} (from neighbor)")
-                    
-                    # print(f"  Final candidates: {cell.candidates}")
+        flat = [cell for row in grid.cells for cell in row]
+        masks = [grid.get_group(cell).all_mask if cell.value is None else 0
+                 for cell in flat]
+
+        for idx, cell in enumerate(flat):
+            if cell.value is not None:
+                clear = ~(1 << (cell.value - 1))
+                for j in blockers[idx]:
+                    masks[j] &= clear
 
+        self._track_groups()
+
+        for cell, mask in zip(flat, masks):
+            cell.candidates_mask = mask
+            # print(f"Cell ({cell.row},{cell.col}) group {cell.group_id}, candidates: {cell.get_candidate_values()}")
 
         
     def _naked_single(self): # LEVEL 1
@@ -192,8 +407,9 @@ class Solver:
         for r in range(self.grid.rows):
             for c in range(self.grid.cols):
                 cell = cells[r][c]
-                if cell.value is None and len(cell.candidates) == 1:
-                    self._place_value(cell, list(cell.candidates)[0])
+                mask = cell.candidates_mask
+                if cell.value is None and mask and not mask & (mask - 1):  # exactly one bit
+                    self._place_value(cell, mask.bit_length())
                     self.techniques_used.add("naked_single")
                     # print(f"Naked sinlge: Placed {cell.value} at ({cell.row}, {cell.col})")
                     is_placed = True
@@ -212,25 +428,35 @@ class Solver:
 
         is_placed = False
 
-        groups = self.grid.groups
+        version = self.group_version
+        seen = self.group_seen.setdefault("hidden_single", {})
 
-        for group in groups:
-            vals = [0] * (group.size + 1)
+        for group in self._changed_groups(seen):
+            seen[group.id] = version[group.id]
+            # One pass: values seen in at least one / at least two cells,
+            # and the last cell seen holding each value
+            once = 0
+            twice = 0
+            last = [None] * (group.size + 1)
             for cell in group.cells:
                 if cell.value is None:  # only empty cells
-                    for cand in cell.candidates:
-                        vals[cand] += 1
-            to_place = [i for i, v in enumerate(vals) if v == 1] # all the singles
-            # After finding which values appear exactly once
-            for value in to_place:
-                # Find which cell has this value as a candidate
-                for cell in group.cells:
-                    if cell.value is None and value in cell.candidates:
-                        self._place_value(cell, value)
-                        self.techniques_used.add("hidden_single")
-                        # print(f"Hidden sinlge: Placed {cell.value} at ({cell.row}, {cell.col})")
-                        is_placed = True
-                        break  # found it, move to next value
+                    mask = cell.candidates_mask
+                    twice |= once & mask
+                    once |= mask
+                    for cand in cell.get_candidate_values():
+                        last[cand] = cell
+            # Values that appear exactly once, placed in ascending order
+            unique = once & ~twice
+            for value in range(1, group.size + 1):
+                if not unique & (1 << (value - 1)):
+                    continue
+                cell = last[value]
+                # an earlier placement in this group may have taken it
+                if cell.value is None and cell.candidates_mask & (1 << (value - 1)):
+                    self._place_value(cell, value)
+                    self.techniques_used.add("hidden_single")
+                    # print(f"Hidden sinlge: Placed {cell.value} at ({cell.row}, {cell.col})")
+                    is_placed = True
         return is_placed
 
     def _neighbor_elimination(self): # LEVEL 2
@@ -245,28 +471,48 @@ class Solver:
         """
         progress = False
 
-        for group in self.grid.groups:
+        if self.grid.neighbor_bits is None:
+            self.grid.index_cells()
+        neighbor_bits = self.grid.neighbor_bits
+        cells = self.grid.cells
+        cols = self.grid.cols
+
+        version = self.group_version
+        seen = self.group_seen.setdefault("neighbor_elimination", {})
+
+        for group in self._changed_groups(seen):
+            seen[group.id] = version[group.id]
             
-            # Create dict {value: [cells]}
+            # Create dict {value: [flat indices of cells]}
             common_cands = {}
             for cell in group.cells:
                 if cell.value is None:  # Only empty cells
-                    for cand in cell.candidates:
+                    idx = cell.idx
+                    for cand in cell.get_candidate_values():
                         if cand not in common_cands:
                             common_cands[cand] = []
-                        common_cands[cand].append(cell)
+                        common_cands[cand].append(idx)
 
             # For each value with multiple cells -> discard from common neighbors
-            for val, cells in common_cands.items(): 
-                if len(cells) > 1:  # Only if multiple cells in group
-                    common_neigh = set(self.grid.get_neighbors(cells[0]))
-                    for i in range(1, len(cells)):  # ← Fixed range
-                        common_neigh &= set(self.grid.get_neighbors(cells[i]))
+            for val, idxs in common_cands.items(): 
+                if len(idxs) > 1:  # Only if multiple cells in group
+                    # Cells adjacent to all of them: AND of their neighbor bitsets
+                    common_neigh = neighbor_bits[idxs[0]]
+                    for i in range(1, len(idxs)):
+                        common_neigh &= neighbor_bits[idxs[i]]
+                        if not common_neigh:
+                            break  # no shared neighbor left, nothing to remove
 
                     # Remove candidates for all concerned cells
-                    for cell in common_neigh:
-                        if cell.value is None and val in cell.candidates:  # ← Check empty and has candidate
-                            cell.candidates.discard(val)
+                    bit = 1 << (val - 1)
+                    while common_neigh:
+                        low = common_neigh & -common_neigh
+                        common_neigh ^= low
+                        j = low.bit_length() - 1
+                        cell = cells[j // cols][j % cols]
+                        if cell.value is None and cell.candidates_mask & bit:  # ← Check empty and has candidate
+                            cell.candidates_mask &= ~bit
+                            version[cell.group_id] += 1
                             self.techniques_used.add("neighbor_elimination")
                             progress = True
 
@@ -287,21 +533,25 @@ class Solver:
 
         progress = False
 
-        for group in self.grid.groups:
+        version = self.group_version
+        seen = self.group_seen.setdefault("naked_pairs", {})
+
+        for group in self._changed_groups(seen):
+            seen[group.id] = version[group.id]
 
-            #Create dict {[candidates]: [cells]}
+            #Create dict {candidate mask: [cells]}
             pairs_cells = {}
             for cell in group.cells:
                 if cell.value is None:  # Only empty cells
-                    cands = frozenset(cell.candidates)
-                    if 2 <= len(cands) <= max_size:
+                    cands = cell.candidates_mask
+                    if 2 <= cands.bit_count() <= max_size:
                         if cands not in pairs_cells:
                             pairs_cells[cands] = []
                         pairs_cells[cands].append(cell)
 
             #Check pairs and apply
             for pair, cells in pairs_cells.items():
-                size_pair = len(pair)
+                size_pair = pair.bit_count()
                 size_cells = len(cells)
                 if size_cells < 2: #nothing to infer
                     continue
@@ -318,44 +568,74 @@ class Solver:
                 for cell in cells: 
                     cells_to_modif.discard(cell)
                 for cell in cells_to_modif:
-                    if cell.value is None:  # Check cell is empty
-                        before = len(cell.candidates)
-                        cell.candidates -= pair  
-                        if len(cell.candidates) < before:
-                            progress = True
-                            self.techniques_used.add("naked_pairs")
+                    if cell.value is None and cell.candidates_mask & pair:  # empty and loses a value
+                        cell.candidates_mask &= ~pair
+                        version[group.id] += 1
+                        progress = True
+                        self.techniques_used.add("naked_pairs")
 
         return progress
     
     #NAKED PAIRS GENERALIZED current version only check EXACT pairs 
     def _naked_subsets_generalized(self, max_size=3):
-        """Generalized naked subsets - handles non-uniform candidates."""
+        """Generalized naked subsets - handles non-uniform candidates.
+
+        Walks the cell combinations of each size in lexicographic order
+        (the order itertools.combinations gives) with an explicit stack of
+        positions into the group's empty cells. The candidate union of every
+        prefix is kept on the stack, so each combo costs one OR, and a prefix
+        whose union already holds more than size values is skipped together
+        with every combination extending it.
+        """
         progress = False
         
-        for group in self.grid.groups:
+        version = self.group_version
+        seen = self.group_seen.setdefault("naked_subsets", {})
+
+        for group in self._changed_groups(seen):
+            seen[group.id] = version[group.id]
             # Get all empty cells
             empty_cells = [c for c in group.cells if c.value is None]
+            masks = [c.candidates_mask for c in empty_cells]
+            n = len(empty_cells)
             
             # Try all combinations of 2-3 cells
-            from itertools import combinations
-            
-            for size in range(2, min(max_size + 1, len(empty_cells) + 1)):
-                for cell_combo in combinations(empty_cells, size):
-                    # Union of all candidates in this combo
-                    union = set()
-                    for cell in cell_combo:
-                        union |= cell.candidates
-                    
+            for size in range(2, min(max_size + 1, n + 1)):
+                combo = []   # positions in empty_cells, increasing
+                unions = []  # unions[d] = candidate union of combo[:d + 1]
+                start = 0
+                while True:
+                    if n - start < size - len(combo):
+                        # not enough cells left to complete it: backtrack
+                        if not combo:
+                            break
+                        start = combo.pop() + 1
+                        unions.pop()
+                        continue
+
+                    union = (unions[-1] if unions else 0) | masks[start]
+                    combo.append(start)
+                    unions.append(union)
+                    count = union.bit_count()
+
+                    if len(combo) < size and count <= size:
+                        start += 1  # extend this prefix
+                        continue
+
                     # If N cells contain exactly N values total: naked subset!
-                    if len(union) == size:
+                    if len(combo) == size and count == size:
                         # Remove these values from other cells
-                        for cell in group.cells:
-                            if cell not in cell_combo and cell.value is None:
-                                before = len(cell.candidates)
-                                cell.candidates -= union
-                                if len(cell.candidates) < before:
-                                    progress = True
-                                    self.techniques_used.add("naked_subsets")
+                        for k in range(n):
+                            if k not in combo and masks[k] & union:
+                                masks[k] &= ~union
+                                empty_cells[k].candidates_mask = masks[k]
+                                version[group.id] += 1
+                                progress = True
+                                self.techniques_used.add("naked_subsets")
+
+                    # next sibling of the last position
+                    start = combo.pop() + 1
+                    unions.pop()
         
         return progress
     
@@ -377,19 +657,22 @@ class Solver:
 
         progress = False
 
-        for group in self.grid.groups:
-            # Create dict {val: [cells]}
-            cands_to_cells = {i: [] for i in range(1, group.size + 1)}
-            for cell in group.cells:
+        version = self.group_version
+        seen = self.group_seen.setdefault("hidden_pairs", {})
+
+        for group in self._changed_groups(seen):
+            seen[group.id] = version[group.id]
+            # Create dict {val: cells}, cells as a bitmask over group.cells positions
+            cands_to_cells = {i: 0 for i in range(1, group.size + 1)}
+            for pos, cell in enumerate(group.cells):
                 if cell.value is None:
-                    for cand in cell.candidates:
-                        cands_to_cells[cand].append(cell)
+                    for cand in cell.get_candidate_values():
+                        cands_to_cells[cand] |= 1 << pos
 
             # Find intersections: Create dict {cell_comb: appearances}
             comb_appear = {}
-            for key, item in cands_to_cells.items():
-                comb = frozenset(item)
-                if len(comb) <= max_size:  # Only check subsets up to max_size
+            for key, comb in cands_to_cells.items():
+                if comb.bit_count() <= max_size:  # Only check subsets up to max_size
                     if comb not in comb_appear:
                         comb_appear[comb] = 0
                     comb_appear[comb] += 1
@@ -398,20 +681,19 @@ class Solver:
             for key, item in comb_appear.items():
                 if item < 2:  # Need at least 2 values
                     continue
-                if item != len(key):  # N values in N cells
+                if item != key.bit_count():  # N values in N cells
                     continue
 
                 # Left over case: hidden pair/triple found
-                cands_to_remove = set(range(1, group.size + 1))
-                for cand, pair in cands_to_cells.items():
-                    if key == frozenset(pair):  # ← Fixed
-                        cands_to_remove.discard(cand)
-
-                for cell in key:
-                    before = len(cell.candidates)
-                    for val in cands_to_remove:
-                        cell.candidates.discard(val)
-                    if len(cell.candidates) < before:
+                cands_to_keep = 0
+                for cand, comb in cands_to_cells.items():
+                    if comb == key:
+                        cands_to_keep |= 1 << (cand - 1)
+
+                for pos, cell in enumerate(group.cells):
+                    if key >> pos & 1 and cell.candidates_mask & ~cands_to_keep:
+                        cell.candidates_mask &= cands_to_keep
+                        version[group.id] += 1
                         progress = True
                         self.techniques_used.add("hidden_pairs")
 
@@ -421,7 +703,7 @@ class Solver:
     def _place_value(self, cell: Cell, value):
         """Place a value in a cell and propagate constraints.
 
-        Sets cell.value, clears cell.candidates.
+        Sets cell.value, clears cell.candidates_mask.
         Removes value from all neighbors' candidates.
         Removes value from all group peers' candidates.
         Raises Contradiction if any cell reaches zero candidates.
@@ -432,17 +714,22 @@ class Solver:
         """
         # print(f"Placing {value} at ({cell.row}, {cell.col})")
         cell.value = value
-        cell.candidates = set()
+        cell.candidates_mask = 0
+        bit = 1 << (value - 1)
+        version = self.group_version
+        version[cell.group_id] += 1  # the cell and its peers
         
         for peer in self.grid.get_group_peers(cell):
-            peer.candidates.discard(value)
-            if peer.value is None and len(peer.candidates) == 0:
+            peer.candidates_mask &= ~bit
+            if peer.value is None and peer.candidates_mask == 0:
                 # print(f"  Contradiction: peer at ({peer.row}, {peer.col}) has no candidates left")
-                # print(f"  Peer group: {peer.group_id}, current candidates were: {peer.candidates}")
+                # print(f"  Peer group: {peer.group_id}, current candidates were: {peer.get_candidate_values()}")
                 raise Contradiction()
         
         for neigh in self.grid.get_neighbors(cell):
-            neigh.candidates.discard(value)
-            if neigh.value is None and len(neigh.candidates) == 0:
+            if neigh.candidates_mask & bit:
+                neigh.candidates_mask &= ~bit
+                version[neigh.group_id] += 1
+            if neigh.value is None and neigh.candidates_mask == 0:
                 # print(f"  Contradiction: neighbor at ({neigh.row}, {neigh.col}) has no candidates left")
-                raise Contradiction()
\ No newline at end of file
+                raise Contradiction()
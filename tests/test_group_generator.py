@@ -1,6 +1,7 @@
 
 import sys
 import os
+from collections import Counter, defaultdict
 
 # Add parent directory to path so imports work
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -49,10 +50,7 @@ def test_group_sizes_within_bounds():
         return
     
     # Count cells per group
-    group_sizes = {}
-    for row in layout:
-        for gid in row:
-            group_sizes[gid] = group_sizes.get(gid, 0) + 1
+    group_sizes = Counter(gid for row in layout for gid in row)
     
     violations = []
     for gid, size in group_sizes.items():
@@ -75,12 +73,9 @@ def test_groups_are_connected():
         return
     
     # Collect cells for each group
-    groups = {}
-    for r in range(len(layout)):
-        for c in range(len(layout[0])):
-            gid = layout[r][c]
-            if gid not in groups:
-                groups[gid] = []
+    groups = defaultdict(list)
+    for r, row in enumerate(layout):
+        for c, gid in enumerate(row):
             groups[gid].append((r, c))
     
     # Check connectivity for each group
@@ -100,11 +95,7 @@ def test_visual_small_grid():
     print("\n=== Visual Test: 5x5 grid ===")
     gen = GroupGenerator(min_size=2, max_size=4)
     
-    attempts = 0
-    layout = None
-    while layout is None and attempts < 10:
-        layout = gen.generate(5, 5)
-        attempts += 1
+    layout, attempts = gen.generate_batch(10, 5, 5)
     
     if layout is None:
         print("FAIL — could not generate valid layout after 10 attempts")
@@ -123,11 +114,7 @@ def test_visual_medium_grid():
     print("\n=== Visual Test: 8x8 grid ===")
     gen = GroupGenerator(min_size=3, max_size=5)
     
-    attempts = 0
-    layout = None
-    while layout is None and attempts < 10:
-        layout = gen.generate(8, 8)
-        attempts += 1
+    layout, attempts = gen.generate_batch(10, 8, 8)
     
     if layout is None:
         print("FAIL — could not generate valid layout after 10 attempts")
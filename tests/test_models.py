@@ -203,10 +203,10 @@ def test_clone_independence():
 def test_clone_candidates_independence():
     """Modifying clone candidates should not affect original."""
     grid = build_test_grid()
-    grid.cells[0][0].candidates = {1, 2, 3}
+    grid.cells[0][0].set_candidate_values({1, 2, 3})
     clone = grid.clone()
-    clone.cells[0][0].candidates.add(99)
-    passed = 99 not in grid.cells[0][0].candidates
+    clone.cells[0][0].set_candidate_values({1, 2, 3, 9})
+    passed = grid.cells[0][0].candidates_mask == 0b111
     print("test_clone_candidates_independence:", "PASS" if passed else "FAIL")
 
 
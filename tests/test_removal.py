@@ -6,7 +6,12 @@ import os
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, parent_dir)
 
+import random
+
+from models import Grid
+from group_generator import GroupGenerator
 from generator import Generator
+from solver import Solver
 
 
 def test_removal_rates():
@@ -28,9 +33,7 @@ def test_removal_rates():
             
             if grid is not None:
                 total = grid.rows * grid.cols
-                filled = sum(1 for r in range(grid.rows) for c in range(grid.cols) 
-                           if grid.cells[r][c].value is not None)
-                removed = total - filled
+                removed = grid.get_values().count(None)
                 removal_rate = removed / total
                 
                 results[f"diff_{difficulty}"].append(removal_rate)
@@ -45,5 +48,64 @@ def test_removal_rates():
             max_rate = max(rates)
             print(f"{diff}: avg={avg:.1%}, min={min_rate:.1%}, max={max_rate:.1%}")
 
+
+def remove_clues_one_by_one(grid, target_difficulty):
+    """Reference clue removal: try each clue alone, in the shuffled order _remove_clues uses."""
+    solver = Solver()
+    filled_cells = [cell for row in grid.cells for cell in row if cell.value is not None]
+    random.shuffle(filled_cells)
+    for cell in filled_cells:
+        value = cell.value
+        cell.value = None
+        if not solver.solve(grid, max_difficulty=target_difficulty).solved:
+            cell.value = value  # needed, restore
+    return grid
+
+
+def test_batched_removal_matches_sequential():
+    """Batched removal should drop exactly the clues one-at-a-time removal drops."""
+    gen = Generator()
+    gen.verbose = False  # normally set by generate()
+    solver = Solver()
+    passed = True
+
+    random.seed(0)
+    grids = []
+    while len(grids) < 6:  # some layouts cannot be filled, retry those
+        grid = Grid(7, 7)
+        grid.build_cells(GroupGenerator(2, 5).generate(7, 7))
+        if gen._fill_grid(grid):
+            grids.append(grid)
+
+    for i, grid in enumerate(grids):
+        target = 1 + i % 3
+        reference = grid.clone()
+
+        random.seed(100 + i)
+        gen._remove_clues(grid, grid.clone(), target)
+        random.seed(100 + i)
+        remove_clues_one_by_one(reference, target)
+
+        same = grid.get_values() == reference.get_values()
+        solvable = solver.solve(grid, max_difficulty=target).solved
+        if not (same and solvable):
+            passed = False
+        print(f"  grid {i}: target {target}, removed {grid.get_values().count(None)}, "
+              f"same as sequential: {same}, solvable: {solvable}")
+
+    print("test_batched_removal_matches_sequential:", "PASS" if passed else "FAIL")
+
+
+def test_workers_same_puzzle():
+    """A fixed seed should give the same puzzle with or without a process pool."""
+    serial = Generator().generate(6, 6, difficulty=2, seed=5, workers=1)
+    parallel = Generator().generate(6, 6, difficulty=2, seed=5, workers=2)
+    passed = (serial is not None and parallel is not None
+              and serial.get_values() == parallel.get_values())
+    print("test_workers_same_puzzle:", "PASS" if passed else "FAIL")
+
+
 if __name__ == "__main__":
+    test_batched_removal_matches_sequential()
+    test_workers_same_puzzle()
     test_removal_rates()
@@ -68,7 +68,7 @@ def test_init_candidates():
     for r in range(4):
         for c in range(4):
             cell = grid.cells[r][c]
-            if cell.value is None and len(cell.candidates) == 0:
+            if cell.value is None and len(cell.get_candidate_values()) == 0:
                 empty_cells_have_candidates = False
     
     passed = empty_cells_have_candidates
@@ -167,6 +167,158 @@ def test_multiple_solutions_detected():
     passed = has_unique == False  # should NOT be unique
     print("test_multiple_solutions_detected:", "PASS" if passed else "FAIL")
 
+
+def test_invalid_clues_not_unique():
+    """Clues that already break a rule have no solution, even if the
+    logical pass fills every remaining cell."""
+    grid = Grid(4, 4)
+    layout = [
+        [0, 2, 2, 2],
+        [0, 0, 2, 2],
+        [12, 0, 0, 11],
+        [12, 12, 0, 11],
+    ]
+    grid.build_cells(layout)
+    # the third row starts with three adjacent 3s
+    grid.set_values([4, 3, None, 2, 1, None, 5, 1, 3, 3, 3, 2, 2, 1, 5, 1])
+    
+    solver = Solver()
+    has_unique = solver.has_unique_solution(grid)
+    
+    passed = has_unique == False
+    print("test_invalid_clues_not_unique:", "PASS" if passed else "FAIL")
+
+
+def build_stalled_puzzle(layout, clues):
+    """Build a puzzle whose clues leave the logical techniques stuck,
+    so counting its solutions has to go through the backtracking search."""
+    grid = Grid(len(layout), len(layout[0]))
+    grid.build_cells(layout)
+    for r in range(grid.rows):
+        for c in range(grid.cols):
+            grid.cells[r][c].value = clues[r][c]
+    return grid
+
+
+def test_search_finds_two_solutions():
+    """Backtracking should find both solutions of a two-solution puzzle."""
+    layout = [
+        [7, 1, 2, 2, 11, 5, 5],
+        [7, 1, 2, 11, 11, 5, 5],
+        [7, 29, 2, 2, 11, 11, 5],
+        [7, 29, 29, 24, 24, 11, 5],
+        [7, 29, 29, 24, 24, 24, 41],
+        [35, 35, 45, 45, 45, 41, 41],
+        [35, 35, 45, 45, 45, 41, 41],
+    ]
+    clues = [
+        [None, 2, None, None, None, None, 1],
+        [4, None, 5, None, None, 2, 5],
+        [None, None, None, None, 5, 1, None],
+        [1, None, 5, None, None, 2, None],
+        [None, None, None, None, None, 5, 4],
+        [None, None, 5, 2, 3, 2, 1],
+        [None, 4, 1, None, 6, None, None],
+    ]
+    grid = build_stalled_puzzle(layout, clues)
+    
+    solver = Solver()
+    stuck = not solver.solve(grid).solved
+    count = solver.count_solutions(grid.clone(), limit=3)
+    
+    passed = stuck and count == 2 and solver.has_unique_solution(grid) == False
+    print("test_search_finds_two_solutions:", "PASS" if passed else "FAIL",
+          f"— stuck={stuck}, count={count}")
+
+
+def test_search_finds_unique_solution():
+    """A unique puzzle the techniques cannot finish should still count as one."""
+    layout = [
+        [0, 0, 2, 3, 3, 3, 3],
+        [0, 2, 2, 2, 19, 19, 19],
+        [14, 14, 2, 24, 24, 19, 19],
+        [14, 14, 14, 24, 24, 27, 27],
+        [28, 28, 28, 24, 27, 27, 27],
+        [35, 35, 37, 37, 37, 40, 40],
+        [35, 35, 37, 37, 40, 40, 40],
+    ]
+    clues = [
+        [2, None, None, None, 2, None, None],
+        [1, None, None, None, None, None, None],
+        [4, None, None, None, None, None, 1],
+        [None, None, None, None, None, 4, None],
+        [None, None, None, None, None, None, None],
+        [None, None, 1, 2, 3, 4, 5],
+        [1, None, None, None, None, 2, 3],
+    ]
+    grid = build_stalled_puzzle(layout, clues)
+    
+    solver = Solver()
+    stuck = not solver.solve(grid).solved
+    count = solver.count_solutions(grid.clone(), limit=3)
+    
+    passed = stuck and count == 1 and solver.has_unique_solution(grid) == True
+    print("test_search_finds_unique_solution:", "PASS" if passed else "FAIL",
+          f"— stuck={stuck}, count={count}")
+
+
+def test_stalled_invalid_clues_not_unique():
+    """Clues that break a rule have no solution, even when the techniques
+    stall and the search would only fill the empty cells."""
+    layout = [
+        [0, 0, 2, 3, 3, 3, 3],
+        [0, 2, 2, 2, 19, 19, 19],
+        [14, 14, 2, 24, 24, 19, 19],
+        [14, 14, 14, 24, 24, 27, 27],
+        [28, 28, 28, 24, 27, 27, 27],
+        [35, 35, 37, 37, 37, 40, 40],
+        [35, 35, 37, 37, 40, 40, 40],
+    ]
+    # The unique puzzle above, plus a 2 at (1, 5) diagonal to the 2 at (0, 4)
+    clues = [
+        [2, None, None, None, 2, None, None],
+        [1, None, None, None, None, 2, None],
+        [4, None, None, None, None, None, 1],
+        [None, None, None, None, None, 4, None],
+        [None, None, None, None, None, None, None],
+        [None, None, 1, 2, 3, 4, 5],
+        [1, None, None, None, None, 2, 3],
+    ]
+    grid = build_stalled_puzzle(layout, clues)
+    
+    solver = Solver()
+    stuck = not solver.solve(grid).solved
+    has_unique = solver.has_unique_solution(grid)
+    
+    passed = not grid.is_valid() and stuck and has_unique == False
+    print("test_stalled_invalid_clues_not_unique:", "PASS" if passed else "FAIL",
+          f"— stuck={stuck}, unique={has_unique}")
+
+
+def test_search_finds_no_solution():
+    """Clues that only reveal a contradiction during search have no solution."""
+    layout = [
+        [0, 0, 2, 3],
+        [0, 0, 2, 3],
+        [9, 9, 2, 3],
+        [9, 9, 2, 3],
+    ]
+    clues = [
+        [None, 1, None, None],
+        [None, None, None, None],
+        [None, None, 4, None],
+        [None, None, None, None],
+    ]
+    grid = build_stalled_puzzle(layout, clues)
+    
+    solver = Solver()
+    stuck = not solver.solve(grid).solved
+    count = solver.count_solutions(grid.clone(), limit=3)
+    
+    passed = stuck and count == 0 and solver.has_unique_solution(grid) == False
+    print("test_search_finds_no_solution:", "PASS" if passed else "FAIL",
+          f"— stuck={stuck}, count={count}")
+
 def manual_test_puzzle(layout, clues):
 
     size = len(layout)
@@ -188,14 +340,14 @@ def changed_cells(grid1, grid2):
         for c in range(grid1.cols):
             cell1 = grid1.cells[r][c]
             cell2 = grid2.cells[r][c]
-            if cell1.value != cell2.value or cell1.candidates != cell2.candidates:
+            if cell1.value != cell2.value or cell1.candidates_mask != cell2.candidates_mask:
                 result.append(cell2)
     return result
 
 def print_all_candidates(grid):
     for row in grid.cells:
         for cell in row:
-            print(cell.candidates)
+            print(set(cell.get_candidate_values()))
 
 def test_naked_single():
     solver = Solver()
@@ -285,4 +437,9 @@ if __name__ == "__main__":
         test_has_unique_solution_on_complete_grid()
         test_has_unique_solution_on_puzzle()
         test_multiple_solutions_detected()
+        test_invalid_clues_not_unique()
+        test_search_finds_two_solutions()
+        test_search_finds_unique_solution()
+        test_stalled_invalid_clues_not_unique()
+        test_search_finds_no_solution()
     print("\n=== done ===")
\ No newline at end of file
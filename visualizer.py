@@ -1,5 +1,6 @@
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from matplotlib.collections import LineCollection
 
 
 GROUP_COLORS = [
@@ -12,6 +13,114 @@ THIN_BORDER  = 0.5
 THICK_BORDER = 3.0
 CELL_SIZE    = 1.0
 
+# (role, rows, cols) -> [fig, ax, event connection ids], see _get_figure
+_FIG_CACHE = {}
+
+
+def _get_figure(role, rows, cols):
+    """Return a cleared Figure/Axes for a grid shape, reusing a cached one.
+
+    Creating a figure is the slow part of drawing a small grid, so a
+    figure that is still open is cleared and handed back instead. Event
+    handlers connected to it by an earlier draw are disconnected.
+
+    Args:
+        role: which window this is ("puzzle" or "solution")
+        rows: number of grid rows
+        cols: number of grid columns
+    Returns:
+        the cache entry [fig, ax, cids]; append new connection ids to cids
+    """
+    key = (role, rows, cols)
+    entry = _FIG_CACHE.get(key)
+    if entry is not None and plt.fignum_exists(entry[0].number):
+        fig, ax, cids = entry
+        for cid in cids:
+            fig.canvas.mpl_disconnect(cid)
+        cids.clear()
+        ax.clear()
+        fig.suptitle("")
+        return entry
+
+    fig, ax = plt.subplots(figsize=(cols * CELL_SIZE + 1, rows * CELL_SIZE + 1))
+    entry = [fig, ax, []]
+    _FIG_CACHE[key] = entry
+    return entry
+
+
+def _draw_cells(grid, ax, fontsize):
+    """Draw the group-colored cells, their values and all borders.
+
+    Args:
+        grid: the grid to draw
+        ax: matplotlib Axes to draw into
+        fontsize: font size for the cell values
+    Returns:
+        2D list of the value Text artists, so callers can change the
+        numbers with set_text() instead of rebuilding every artist
+    """
+    rows = grid.rows
+    cols = grid.cols
+
+    # Draw cells
+    texts = []
+    for r in range(rows):
+        row_texts = []
+        for c in range(cols):
+            cell = grid.cells[r][c]
+            color = GROUP_COLORS[cell.group_id % len(GROUP_COLORS)]
+            
+            rect = patches.Rectangle(
+                (c, rows - r - 1),
+                CELL_SIZE, CELL_SIZE,
+                linewidth=0,
+                facecolor=color
+            )
+            ax.add_patch(rect)
+            
+            value_text = str(cell.value) if cell.value is not None else ""
+            row_texts.append(ax.text(
+                c + CELL_SIZE / 2,
+                rows - r - 1 + CELL_SIZE / 2,
+                value_text,
+                ha="center", va="center",
+                fontsize=fontsize, fontweight="bold"
+            ))
+        texts.append(row_texts)
+    
+    # Draw borders, all in one LineCollection instead of a Line2D per edge
+    # Group IDs are read once into a plain matrix for the two edge scans
+    group_ids = [[cell.group_id for cell in row] for row in grid.cells]
+    segments = []
+    widths = []
+    for r in range(1, rows):
+        for c in range(cols):
+            above = group_ids[r - 1][c]
+            below = group_ids[r][c]
+            widths.append(THICK_BORDER if above != below else THIN_BORDER)
+            y = rows - r
+            segments.append(((c, y), (c + 1, y)))
+    
+    for r in range(rows):
+        for c in range(1, cols):
+            left  = group_ids[r][c - 1]
+            right = group_ids[r][c]
+            widths.append(THICK_BORDER if left != right else THIN_BORDER)
+            y = rows - r - 1
+            segments.append(((c, y), (c, y + 1)))
+    
+    ax.add_collection(LineCollection(segments, linewidths=widths, colors="black",
+                                     capstyle="projecting"))
+    
+    outer = patches.Rectangle(
+        (0, 0), cols, rows,
+        linewidth=THICK_BORDER,
+        edgecolor="black",
+        facecolor="none"
+    )
+    ax.add_patch(outer)
+    return texts
+
 
 def _draw_static_grid(grid, ax, fig, title):
         """Draw a non-interactive grid (for showing solution)."""
@@ -28,53 +137,7 @@ def _draw_static_grid(grid, ax, fig, title):
         ax.axis("off")
         ax.set_title(title, fontsize=16, pad=10)
         
-        # Draw cells
-        for r in range(rows):
-            for c in range(cols):
-                cell = grid.cells[r][c]
-                color = GROUP_COLORS[cell.group_id % len(GROUP_COLORS)]
-                
-                rect = patches.Rectangle(
-                    (c, rows - r - 1),
-                    CELL_SIZE, CELL_SIZE,
-                    linewidth=0,
-                    facecolor=color
-                )
-                ax.add_patch(rect)
-                
-                value_text = str(cell.value) if cell.value is not None else ""
-                ax.text(
-                    c + CELL_SIZE / 2,
-                    rows - r - 1 + CELL_SIZE / 2,
-                    value_text,
-                    ha="center", va="center",
-                    fontsize=fontsize, fontweight="bold"
-                )
-        
-        # Draw borders (same as before)
-        for r in range(1, rows):
-            for c in range(cols):
-                above = grid.cells[r - 1][c].group_id
-                below = grid.cells[r][c].group_id
-                width = THICK_BORDER if above != below else THIN_BORDER
-                y = rows - r
-                ax.plot([c, c + 1], [y, y], color="black", linewidth=width)
-        
-        for r in range(rows):
-            for c in range(1, cols):
-                left  = grid.cells[r][c - 1].group_id
-                right = grid.cells[r][c].group_id
-                width = THICK_BORDER if left != right else THIN_BORDER
-                y = rows - r - 1
-                ax.plot([c, c], [y, y + 1], color="black", linewidth=width)
-        
-        outer = patches.Rectangle(
-            (0, 0), cols, rows,
-            linewidth=THICK_BORDER,
-            edgecolor="black",
-            facecolor="none"
-        )
-        ax.add_patch(outer)
+        _draw_cells(grid, ax, fontsize)
 
 def draw_grid(grid, solution=None):
     """Render the grid with interactive number input.
@@ -87,12 +150,12 @@ def draw_grid(grid, solution=None):
     cols = grid.cols
     
     if solution is not None:
-        fig_sol, ax_sol = plt.subplots(figsize=(cols * CELL_SIZE + 1, rows * CELL_SIZE + 1))
+        fig_sol, ax_sol, _ = _get_figure("solution", rows, cols)
         _draw_static_grid(solution, ax_sol, fig_sol, "Solution")
 
     selected_cell = [None]
     
-    fig, ax = plt.subplots(figsize=(cols * CELL_SIZE + 1, rows * CELL_SIZE + 1))
+    fig, ax, cids = _get_figure("puzzle", rows, cols)
     fig.canvas.manager.set_window_title("Puzzle (interactive)")
     
     dpi = fig.dpi
@@ -104,13 +167,25 @@ def draw_grid(grid, solution=None):
     ax.set_aspect("equal")
     ax.axis("off")
     
+    # Colors and borders never change, so every artist is built once;
+    # redraw() only updates the numbers and the selection box.
+    texts = _draw_cells(grid, ax, fontsize)
+    highlight = patches.Rectangle(
+        (0, 0),
+        CELL_SIZE, CELL_SIZE,
+        linewidth=3,
+        edgecolor="red",
+        facecolor="none",
+        visible=False
+    )
+    ax.add_patch(highlight)
+    
     def check_completion():
         """Check if puzzle is complete and valid."""
 
         is_complete = grid.is_complete()
-        is_valid = grid.is_valid()
-        # print(f"DEBUG: complete={is_complete}, valid={is_valid}")  # ← Add this
-        if not grid.is_complete():
+        # print(f"DEBUG: complete={is_complete}")  # ← Add this
+        if not is_complete:
             return None
         
         if grid.is_valid():
@@ -120,12 +195,6 @@ def draw_grid(grid, solution=None):
     
     def redraw():
         """Redraw the grid with current values."""
-        ax.clear()
-        ax.set_xlim(0, cols)
-        ax.set_ylim(0, rows)
-        ax.set_aspect("equal")
-        ax.axis("off")
-        
         # Check completion status - set on FIGURE not axes
         status = check_completion()
         if status:
@@ -134,67 +203,21 @@ def draw_grid(grid, solution=None):
         else:
             fig.suptitle("")  # ← Clear title when not complete
         
-        # Draw cells
+        # Update cell values
         for r in range(rows):
             for c in range(cols):
-                cell = grid.cells[r][c]
-                color = GROUP_COLORS[cell.group_id % len(GROUP_COLORS)]
-                
-                rect = patches.Rectangle(
-                    (c, rows - r - 1),
-                    CELL_SIZE, CELL_SIZE,
-                    linewidth=0,
-                    facecolor=color
-                )
-                ax.add_patch(rect)
-                
-                value_text = str(cell.value) if cell.value is not None else ""
-                ax.text(
-                    c + CELL_SIZE / 2,
-                    rows - r - 1 + CELL_SIZE / 2,
-                    value_text,
-                    ha="center", va="center",
-                    fontsize=fontsize, fontweight="bold"
-                )
+                value = grid.cells[r][c].value
+                texts[r][c].set_text(str(value) if value is not None else "")
         
-        # Draw selected cell highlight
+        # Move selected cell highlight
         if selected_cell[0] is not None:
             r, c = selected_cell[0]
-            highlight = patches.Rectangle(
-                (c, rows - r - 1),
-                CELL_SIZE, CELL_SIZE,
-                linewidth=3,
-                edgecolor="red",
-                facecolor="none"
-            )
-            ax.add_patch(highlight)
-        
-        # Draw borders
-        for r in range(1, rows):
-            for c in range(cols):
-                above = grid.cells[r - 1][c].group_id
-                below = grid.cells[r][c].group_id
-                width = THICK_BORDER if above != below else THIN_BORDER
-                y = rows - r
-                ax.plot([c, c + 1], [y, y], color="black", linewidth=width)
-        
-        for r in range(rows):
-            for c in range(1, cols):
-                left  = grid.cells[r][c - 1].group_id
-                right = grid.cells[r][c].group_id
-                width = THICK_BORDER if left != right else THIN_BORDER
-                y = rows - r - 1
-                ax.plot([c, c], [y, y + 1], color="black", linewidth=width)
-        
-        outer = patches.Rectangle(
-            (0, 0), cols, rows,
-            linewidth=THICK_BORDER,
-            edgecolor="black",
-            facecolor="none"
-        )
-        ax.add_patch(outer)
+            highlight.set_xy((c, rows - r - 1))
+            highlight.set_visible(True)
+        else:
+            highlight.set_visible(False)
         
-        fig.canvas.draw()
+        fig.canvas.draw_idle()
     
     def on_click(event):
         """Handle mouse clicks to select cells."""
@@ -228,8 +251,8 @@ def draw_grid(grid, solution=None):
             cell.value = None
             redraw()
     
-    fig.canvas.mpl_connect('button_press_event', on_click)
-    fig.canvas.mpl_connect('key_press_event', on_key)
+    cids.append(fig.canvas.mpl_connect('button_press_event', on_click))
+    cids.append(fig.canvas.mpl_connect('key_press_event', on_key))
     
     redraw()
     